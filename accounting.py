@@ -0,0 +1,202 @@
+"""
+Character accounting and budgets for backend requests.
+
+The backend is billed and throttled per character, so NeuralTranslator
+records the exact characters of every request it sends (after packing,
+stripping and transliteration), per request kind, target language and
+caller. Budgets cap characters per rolling time window; when a budget runs
+low the translator switches to cheaper strategies, and when it is used up
+requests that cannot be answered from the cache raise BudgetExceededError.
+"""
+import contextlib
+import contextvars
+import threading
+import time
+from collections import deque
+
+# Usage dicts of the track() blocks active in the current thread/task
+_trackers = contextvars.ContextVar('usage_trackers', default=())
+
+
+class BudgetExceededError(Exception):
+    """
+    Raised when a request would take a budget over its limit.
+    """
+
+
+def _counter():
+    return {'requests': 0, 'chars': 0, 'cache_hits': 0, 'saved_chars': 0, 'failures': 0, 'fallbacks': 0}
+
+
+class CharacterMeter:
+    def __init__(self, low_watermark=0.1):
+        """
+        low_watermark: fraction of a budget left at which cheaper strategies kick in.
+        """
+        self.low_watermark = low_watermark
+        self.budgets = []
+        self._lock = threading.Lock()
+        self._total = _counter()
+        self._by_kind = {}
+        self._by_target = {}
+        self._by_caller = {}
+
+    def add_budget(self, limit, window=86400, target=None, caller=None, kinds=None):
+        """
+        Allow at most limit characters per rolling window (seconds).
+        target/caller/kinds restrict the budget to matching requests (None = all).
+        """
+        budget = {'limit': limit, 'window': window, 'target': target, 'caller': caller,
+                  'kinds': kinds, 'events': deque(), 'used': 0}
+        with self._lock:
+            self.budgets.append(budget)
+        return budget
+
+    def _matching(self, kind, target, caller):
+        for budget in self.budgets:
+            if budget['target'] not in (None, target):
+                continue
+            if budget['caller'] not in (None, caller):
+                continue
+            if budget['kinds'] and kind not in budget['kinds']:
+                continue
+            yield budget
+
+    def _expire(self, budget, now):
+        events = budget['events']
+        while events and events[0][0] <= now - budget['window']:
+            budget['used'] -= events.popleft()[1]
+
+    def check(self, chars, kind='translate', target=None, caller=None):
+        """
+        Raise BudgetExceededError if sending chars now would exceed a budget.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for budget in self._matching(kind, target, caller):
+                self._expire(budget, now)
+                if budget['used'] + chars > budget['limit']:
+                    raise BudgetExceededError(
+                        f"Character budget exhausted ({budget['used']}/{budget['limit']} "
+                        f"per {budget['window']}s, target={budget['target']}, caller={budget['caller']})")
+
+    def record(self, chars, kind='translate', target=None, caller=None):
+        """
+        Count one backend request of chars characters.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for counter in self._counters(kind, target, caller):
+                counter['requests'] += 1
+                counter['chars'] += chars
+            for budget in self._matching(kind, target, caller):
+                budget['events'].append((now, chars))
+                budget['used'] += chars
+        for usage in _trackers.get():
+            usage['requests'] += 1
+            usage['chars'] += chars
+
+    def record_saved(self, chars, kind='translate', target=None, caller=None):
+        """
+        Count a request answered locally (cache hit) instead of by the backend.
+        """
+        with self._lock:
+            for counter in self._counters(kind, target, caller):
+                counter['cache_hits'] += 1
+                counter['saved_chars'] += chars
+        for usage in _trackers.get():
+            usage['cache_hits'] += 1
+            usage['saved_chars'] += chars
+
+    def record_failure(self, kind='translate', target=None, caller=None):
+        """
+        Count a backend request that raised (no characters are charged).
+        """
+        with self._lock:
+            for counter in self._counters(kind, target, caller):
+                counter['failures'] += 1
+        for usage in _trackers.get():
+            usage['failures'] += 1
+
+    def record_fallback(self, error=None):
+        """
+        Count a degraded answer: an error was swallowed and a fallback used instead.
+        """
+        with self._lock:
+            self._total['fallbacks'] += 1
+        for usage in _trackers.get():
+            usage['fallbacks'] += 1
+            if error is not None:
+                usage['last_error'] = type(error).__name__
+
+    def record_error(self, error):
+        """
+        Note the exception behind an "Error: ..." result in the active track() blocks.
+        """
+        for usage in _trackers.get():
+            usage['last_error'] = type(error).__name__
+
+    def _counters(self, kind, target, caller):
+        # Called with the lock held
+        yield self._total
+        yield self._by_kind.setdefault(kind, _counter())
+        if target:
+            yield self._by_target.setdefault(target, _counter())
+        yield self._by_caller.setdefault(caller or 'default', _counter())
+
+    def remaining(self, kind='translate', target=None, caller=None):
+        """
+        Characters left in the tightest matching budget (None if unlimited).
+        """
+        now = time.monotonic()
+        with self._lock:
+            left = None
+            for budget in self._matching(kind, target, caller):
+                self._expire(budget, now)
+                budget_left = budget['limit'] - budget['used']
+                left = budget_left if left is None else min(left, budget_left)
+            return left
+
+    def is_low(self, kind='translate', target=None, caller=None):
+        """
+        True if any matching budget is below the low watermark.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for budget in self._matching(kind, target, caller):
+                self._expire(budget, now)
+                if budget['limit'] - budget['used'] < budget['limit'] * self.low_watermark:
+                    return True
+            return False
+
+    def usage(self):
+        """
+        Snapshot of all counters and budgets.
+        """
+        now = time.monotonic()
+        with self._lock:
+            budgets = []
+            for budget in self.budgets:
+                self._expire(budget, now)
+                budgets.append({key: budget[key] for key in ('limit', 'window', 'target', 'caller', 'kinds', 'used')})
+            return {
+                'total': dict(self._total),
+                'by_kind': {k: dict(v) for k, v in self._by_kind.items()},
+                'by_target': {k: dict(v) for k, v in self._by_target.items()},
+                'by_caller': {k: dict(v) for k, v in self._by_caller.items()},
+                'budgets': budgets,
+            }
+
+    @contextlib.contextmanager
+    def track(self):
+        """
+        Collect the usage of the calls made inside the with-block:
+        with translator.meter.track() as usage: translator.translate(...)
+        """
+        usage = _counter()
+        usage['last_error'] = None
+        token = _trackers.set(_trackers.get() + (usage,))
+        try:
+            yield usage
+        finally:
+            _trackers.reset(token)
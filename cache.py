@@ -0,0 +1,192 @@
+"""
+In-memory cache of backend answers (translations, transliterations and
+language detections), shared by all calls of a NeuralTranslator.
+
+The cache can be exported to a pack file and packs can be loaded at startup
+to warm a new node. A pack is a read-only, memory-mapped file:
+
+    header   magic "NTPK", format version, entry count
+    index    one fixed-size record per entry, sorted by key bytes:
+             (offset of key in data area, key length, value length)
+    data     key bytes immediately followed by value bytes (UTF-8)
+
+Lookups binary-search the index directly in the mapping, so a pack is
+usable as soon as it is opened without parsing entries into Python objects.
+"""
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+PACK_MAGIC = b'NTPK'
+PACK_VERSION = 1
+
+_HEADER = struct.Struct('<4sHHQ')   # magic, version, reserved, entry count
+_ENTRY = struct.Struct('<QII')      # key offset in data area, key length, value length
+_PART = struct.Struct('<I')
+
+
+def _encode_key(key):
+    # Length-prefixed parts so any text (including separators) round-trips
+    data = bytearray()
+    for part in key:
+        encoded = part.encode('utf-8')
+        data += _PART.pack(len(encoded)) + encoded
+    return bytes(data)
+
+
+def _decode_key(data):
+    parts = []
+    pos = 0
+    while pos < len(data):
+        (length,) = _PART.unpack_from(data, pos)
+        pos += _PART.size
+        parts.append(data[pos:pos + length].decode('utf-8'))
+        pos += length
+    return tuple(parts)
+
+
+def write_pack(path, items):
+    """
+    Write (key tuple, value) pairs to a pack file; later duplicates win.
+    """
+    entries = {}
+    for key, value in items:
+        entries[_encode_key(key)] = str(value).encode('utf-8')
+
+    index = bytearray()
+    data = bytearray()
+    for key in sorted(entries):
+        value = entries[key]
+        index += _ENTRY.pack(len(data), len(key), len(value))
+        data += key + value
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, len(entries)))
+        f.write(index)
+        f.write(data)
+    os.replace(temp_path, path)
+    return len(entries)
+
+
+class CachePack:
+    """
+    Read-only view of a pack file. Entries stay in the memory mapping and
+    are decoded only when looked up.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count = _HEADER.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a translation cache pack")
+        if version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"{path} has pack version {version}, expected {PACK_VERSION}")
+        self._index = _HEADER.size
+        self._data = self._index + self.count * _ENTRY.size
+
+    def _entry(self, n):
+        offset, key_length, value_length = _ENTRY.unpack_from(self._map, self._index + n * _ENTRY.size)
+        start = self._data + offset
+        return start, key_length, value_length
+
+    def get(self, key):
+        target = _encode_key(key)
+        low = 0
+        high = self.count
+        while low < high:
+            middle = (low + high) // 2
+            start, key_length, value_length = self._entry(middle)
+            current = self._map[start:start + key_length]
+            if current < target:
+                low = middle + 1
+            elif current > target:
+                high = middle
+            else:
+                value_start = start + key_length
+                return self._map[value_start:value_start + value_length].decode('utf-8')
+        return None
+
+    def items(self):
+        for n in range(self.count):
+            start, key_length, value_length = self._entry(n)
+            key = _decode_key(self._map[start:start + key_length])
+            value_start = start + key_length
+            yield key, self._map[value_start:value_start + value_length].decode('utf-8')
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+
+class TranslationCache:
+    """
+    Thread-safe LRU cache. Keys are tuples starting with the namespace:
+    ('translate', source, target, text), ('transliterate', lang, text), ('detect', text).
+    """
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self.packs = []
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        # Fall back to loaded packs (newest first); hits are promoted into memory
+        for pack in reversed(self.packs):
+            value = pack.get(key)
+            if value is not None:
+                self.put(key, value)
+                return value
+        return None
+
+    def put(self, key, value):
+        if value is None:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def items(self):
+        with self._lock:
+            return list(self._entries.items())
+
+    def load_pack(self, path):
+        """
+        Serve lookups from a pack file (memory-mapped, nothing is loaded up front).
+        """
+        pack = CachePack(path)
+        self.packs.append(pack)
+        return pack
+
+    def export_pack(self, path):
+        """
+        Write the loaded packs and the in-memory entries to one pack file.
+        Returns the number of entries written.
+        """
+        def all_items():
+            for pack in self.packs:
+                yield from pack.items()
+            yield from self.items()
+        return write_pack(path, all_items())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
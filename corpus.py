@@ -0,0 +1,133 @@
+"""
+Bulk corpus translation across worker processes.
+
+The input is cut into shards of lines and each worker process keeps one warm
+NeuralTranslator for its whole life, so the CPU-bound local stages (pattern
+scans, segmentation, packing) run on every core. Only shard text crosses
+process boundaries: the pattern lexicon is module-level data in translator.py,
+built once per worker at import and shared copy-on-write where the platform
+forks. A token bucket in shared memory applies one backend request rate to all
+workers together, and results are yielded in input order.
+"""
+import argparse
+import collections
+import itertools
+import multiprocessing
+import os
+import time
+from translator import NeuralTranslator
+
+MODES = ['batch', 'translate', 'smart', 'mixed']
+
+
+class SharedRateLimiter:
+    """
+    Token bucket kept in shared memory so every worker process draws from
+    the same backend request budget (requests per second).
+    """
+    def __init__(self, rate, burst=None, context=None):
+        context = context or multiprocessing
+        self.rate = float(rate)
+        self.burst = float(burst or max(1, rate))
+        self._lock = context.Lock()
+        self._tokens = context.RawValue('d', self.burst)
+        self._updated = context.RawValue('d', time.monotonic())
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens = min(self.burst, self._tokens.value + (now - self._updated.value) * self.rate)
+                self._updated.value = now
+                if tokens >= 1:
+                    self._tokens.value = tokens - 1
+                    return
+                self._tokens.value = tokens
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+# Per-process state, set once by the pool initializer
+_worker = {}
+
+
+def _init_worker(dest, src, mode, rate_limiter):
+    _worker['translator'] = NeuralTranslator(rate_limiter=rate_limiter)
+    _worker['dest'] = dest
+    _worker['src'] = src
+    _worker['mode'] = mode
+
+
+def _translate_shard(shard):
+    translator = _worker['translator']
+    dest = _worker['dest']
+    src = _worker['src']
+    mode = _worker['mode']
+
+    if mode == 'batch':
+        return translator.translate_many(shard, dest=dest, src=src)
+    if mode == 'smart':
+        return [translator.translate_smart(text, dest=dest) for text in shard]
+    if mode == 'mixed':
+        return [translator.translate_mixed_text(text, dest=dest) for text in shard]
+    return [translator.translate(text, dest=dest, src=src) for text in shard]
+
+
+def _shards(texts, shard_size):
+    iterator = iter(texts)
+    while True:
+        shard = list(itertools.islice(iterator, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def translate_corpus(texts, dest='en', src='auto', mode='batch', processes=None, shard_size=200, rate=None):
+    """
+    Translate an iterable of texts with a pool of worker processes.
+    Yields one translation per input text, in input order. rate caps backend
+    requests per second across all workers combined.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose from: {', '.join(MODES)}")
+
+    processes = processes or os.cpu_count() or 1
+    context = multiprocessing.get_context()
+    rate_limiter = SharedRateLimiter(rate, context=context) if rate else None
+
+    with context.Pool(processes, initializer=_init_worker, initargs=(dest, src, mode, rate_limiter)) as pool:
+        # Keep a bounded number of shards in flight so huge inputs are streamed, not loaded
+        pending = collections.deque()
+        for shard in _shards(texts, shard_size):
+            pending.append(pool.apply_async(_translate_shard, (shard,)))
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translate a text corpus (one segment per line) using all CPU cores.")
+    parser.add_argument('input', help="input file, one text per line")
+    parser.add_argument('output', help="output file, one translation per line")
+    parser.add_argument('dest', help="target language code")
+    parser.add_argument('--src', default='auto', help="source language code (default: auto)")
+    parser.add_argument('--mode', default='batch', choices=MODES, help="translation strategy (default: batch)")
+    parser.add_argument('--processes', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--shard-size', type=int, default=200, help="lines per shard (default: 200)")
+    parser.add_argument('--rate', type=float, default=None, help="max backend requests per second, all workers")
+    args = parser.parse_args()
+
+    with open(args.input, encoding='utf-8') as infile, open(args.output, 'w', encoding='utf-8') as outfile:
+        lines = (line.rstrip('\r\n') for line in infile)
+        translations = translate_corpus(lines, dest=args.dest, src=args.src, mode=args.mode,
+                                        processes=args.processes, shard_size=args.shard_size, rate=args.rate)
+        count = 0
+        for translation in translations:
+            outfile.write(" ".join(translation.split("\n")) + "\n")
+            count += 1
+    print(f"Translated {count} lines to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Traffic replay load test for NeuralTranslator.
+
+Replays a recorded request log (JSONL, one request per line) with an
+open-loop arrival process: requests are started on schedule whether or not
+earlier ones have finished, and latency is measured from the scheduled
+arrival time, so queueing shows up in the percentiles. By default the
+translator talks to a local StubBackend with configurable latency and
+failure rate; --real uses the Google backend.
+
+Log line format:
+    {"text": "...", "target": "hi", "mode": "smart", "src": "auto", "at": 1.25}
+mode is one of MODES (default "translate"); "at" (seconds from start) is
+only used with --arrival recorded. The report (throughput, latency
+percentiles, backend calls and characters per request, error rates) is
+printed and can be saved as JSON and compared with an earlier report.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from translator import NeuralTranslator
+from cache import TranslationCache
+from scheduler import RequestScheduler
+from tracing import Tracer
+
+MODES = {
+    'translate': lambda t, r: t.translate(r['text'], dest=r['target'], src=r.get('src', 'auto'), split_sentences=False),
+    'sentences': lambda t, r: t.translate(r['text'], dest=r['target'], src=r.get('src', 'auto'), split_sentences=True),
+    'smart': lambda t, r: t.translate_smart(r['text'], dest=r['target']),
+    'mixed': lambda t, r: t.translate_mixed_text(r['text'], dest=r['target']),
+    'transliteration': lambda t, r: t.translate_with_transliteration(r['text'], dest=r['target'])[0],
+}
+
+
+class StubBackend:
+    """
+    Local stand-in for GoogleBackend: sleeps for a configurable latency and
+    fails a configurable fraction of requests. Translations are the input
+    lines prefixed with the target code, so packed batches re-split cleanly.
+    """
+    def __init__(self, latency=0.2, jitter=0.05, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _request(self):
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._random.gauss(self.latency, self.jitter))
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        time.sleep(delay)
+        if fail:
+            raise ConnectionError("stub backend: simulated failure")
+
+    def translate(self, text, source='auto', target='en'):
+        self._request()
+        return "\n".join(f"[{target}] {line}" if line.strip() else line for line in text.split("\n"))
+
+    def detect(self, texts):
+        self._request()
+        return ['en' for _ in texts]
+
+    def transliterate(self, text, lang_code='hi'):
+        self._request()
+        return text
+
+
+def load_requests(path, limit=None):
+    requests = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            request.setdefault('mode', 'translate')
+            if request['mode'] not in MODES:
+                raise ValueError(f"Unknown mode '{request['mode']}' in {path}")
+            requests.append(request)
+            if limit and len(requests) >= limit:
+                break
+    return requests
+
+
+def arrival_times(requests, rate=None, arrival='poisson', seed=None):
+    """
+    Scheduled start time (seconds from the start of the run) of each request.
+    """
+    if arrival == 'recorded':
+        first = requests[0].get('at', 0) if requests else 0
+        return [request.get('at', 0) - first for request in requests]
+    if not rate:
+        raise ValueError("--rate is required for poisson/uniform arrivals")
+    rng = random.Random(seed)
+    times = []
+    now = 0.0
+    for _ in requests:
+        times.append(now)
+        now += rng.expovariate(rate) if arrival == 'poisson' else 1.0 / rate
+    return times
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(translator, requests, times, max_in_flight=256):
+    """
+    Replay requests open-loop and return the report dict.
+    """
+    results = [None] * len(requests)
+
+    def execute(n, scheduled, started_at):
+        request = requests[n]
+        error = None
+        with translator.meter.track() as usage:
+            try:
+                output = MODES[request['mode']](translator, request)
+                if isinstance(output, str) and output.startswith("Error:"):
+                    # The translator caught the exception; its type was noted in usage
+                    error = usage['last_error'] or 'Error'
+            except Exception as e:
+                error = type(e).__name__
+        latency = time.monotonic() - (started_at + scheduled)
+        results[n] = {'mode': request['mode'], 'latency': latency, 'error': error,
+                      'degraded': error is None and usage['fallbacks'] > 0,
+                      'backend_calls': usage['requests'] + usage['failures'],
+                      'backend_failures': usage['failures'], 'chars': usage['chars'],
+                      'cache_hits': usage['cache_hits']}
+
+    started_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        for n, scheduled in enumerate(times):
+            delay = started_at + scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(execute, n, scheduled, started_at)
+    duration = time.monotonic() - started_at
+    return build_report(results, duration)
+
+
+def build_report(results, duration):
+    latencies = sorted(r['latency'] for r in results)
+    errors = [r for r in results if r['error']]
+    error_types = {}
+    for r in errors:
+        error_types[r['error']] = error_types.get(r['error'], 0) + 1
+
+    by_mode = {}
+    for mode in sorted(set(r['mode'] for r in results)):
+        mode_latencies = sorted(r['latency'] for r in results if r['mode'] == mode)
+        by_mode[mode] = {
+            'requests': len(mode_latencies),
+            'p50': _percentile(mode_latencies, 0.50),
+            'p99': _percentile(mode_latencies, 0.99),
+        }
+
+    count = len(results) or 1
+    return {
+        'requests': len(results),
+        'duration': duration,
+        'throughput': len(results) / duration if duration else None,
+        'latency': {
+            'mean': sum(latencies) / count,
+            'p50': _percentile(latencies, 0.50),
+            'p95': _percentile(latencies, 0.95),
+            'p99': _percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else None,
+        },
+        'backend_calls_per_request': sum(r['backend_calls'] for r in results) / count,
+        'backend_failures_per_request': sum(r['backend_failures'] for r in results) / count,
+        'chars_per_request': sum(r['chars'] for r in results) / count,
+        'cache_hits_per_request': sum(r['cache_hits'] for r in results) / count,
+        'error_rate': len(errors) / count,
+        'degraded_rate': sum(1 for r in results if r['degraded']) / count,
+        'errors': error_types,
+        'by_mode': by_mode,
+    }
+
+
+def print_report(report, baseline=None):
+    def line(label, value, key=None, lower_is_better=True, fmt="{:.3f}"):
+        text = f"  {label:<28} {fmt.format(value) if value is not None else '-'}"
+        if baseline is not None and key is not None:
+            old = baseline
+            for part in key.split('.'):
+                old = old.get(part) if isinstance(old, dict) else None
+            if old not in (None, 0) and value is not None:
+                change = (value - old) / old * 100
+                better = (change < 0) == lower_is_better
+                text += f"   ({change:+.1f}% vs baseline{'' if abs(change) < 1 else ', better' if better else ', worse'})"
+        print(text)
+
+    print("=" * 80)
+    print("LOAD TEST REPORT")
+    print("=" * 80)
+    line("Requests", report['requests'], fmt="{}")
+    line("Duration (s)", report['duration'])
+    line("Throughput (req/s)", report['throughput'], 'throughput', lower_is_better=False)
+    line("Latency mean (s)", report['latency']['mean'], 'latency.mean')
+    line("Latency p50 (s)", report['latency']['p50'], 'latency.p50')
+    line("Latency p95 (s)", report['latency']['p95'], 'latency.p95')
+    line("Latency p99 (s)", report['latency']['p99'], 'latency.p99')
+    line("Backend calls / request", report['backend_calls_per_request'], 'backend_calls_per_request')
+    line("Backend failures / request", report['backend_failures_per_request'], 'backend_failures_per_request')
+    line("Characters / request", report['chars_per_request'], 'chars_per_request', fmt="{:.1f}")
+    line("Error rate", report['error_rate'], 'error_rate', fmt="{:.2%}")
+    for kind, count in report['errors'].items():
+        print(f"    {kind}: {count}")
+    line("Degraded (fallback) rate", report['degraded_rate'], 'degraded_rate', fmt="{:.2%}")
+    if 'stub' in report:
+        stub = report['stub']
+        print(f"  Stub backend: {stub['calls']} calls, {stub['failures']} failed ({stub['failure_rate']:.2%})")
+    for mode, stats in report['by_mode'].items():
+        print(f"  [{mode}] {stats['requests']} requests, p50 {stats['p50']:.3f}s, p99 {stats['p99']:.3f}s")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a JSONL request log against NeuralTranslator.")
+    parser.add_argument('log', help="JSONL request log")
+    parser.add_argument('--rate', type=float, help="arrivals per second (poisson/uniform)")
+    parser.add_argument('--arrival', default='poisson', choices=['poisson', 'uniform', 'recorded'])
+    parser.add_argument('--limit', type=int, help="replay only the first N requests")
+    parser.add_argument('--max-in-flight', type=int, default=256, help="threads available for concurrent requests")
+    parser.add_argument('--real', action='store_true', help="use the Google backend instead of the stub")
+    parser.add_argument('--stub-latency', type=float, default=0.2, help="stub backend mean latency (s)")
+    parser.add_argument('--stub-jitter', type=float, default=0.05, help="stub backend latency std dev (s)")
+    parser.add_argument('--stub-failure-rate', type=float, default=0.0, help="fraction of stub requests that fail")
+    parser.add_argument('--scheduler', type=int, metavar='N', help="route backend calls through a RequestScheduler with N slots")
+    parser.add_argument('--no-cache', action='store_true', help="disable the translation cache")
+    parser.add_argument('--trace', metavar='FILE', help="append traces of slow requests to a JSONL file")
+    parser.add_argument('--trace-threshold', type=float, default=1.0, help="latency (s) above which requests are traced")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', help="save the report as JSON")
+    parser.add_argument('--compare', help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    requests = load_requests(args.log, limit=args.limit)
+    times = arrival_times(requests, rate=args.rate, arrival=args.arrival, seed=args.seed)
+
+    backend = None
+    if not args.real:
+        backend = StubBackend(latency=args.stub_latency, jitter=args.stub_jitter,
+                              failure_rate=args.stub_failure_rate, seed=args.seed)
+    scheduler = None
+    if args.scheduler:
+        # One slot is reserved for interactive traffic unless there is only one
+        scheduler = RequestScheduler(concurrency=args.scheduler, reserved_interactive=min(1, args.scheduler - 1))
+    cache = TranslationCache(max_entries=0) if args.no_cache else None
+    tracer = Tracer(threshold=args.trace_threshold, path=args.trace) if args.trace else None
+    translator = NeuralTranslator(backend=backend, scheduler=scheduler, cache=cache, tracer=tracer)
+
+    report = run(translator, requests, times, max_in_flight=args.max_in_flight)
+    if backend is not None:
+        report['stub'] = {'calls': backend.calls, 'failures': backend.failures,
+                          'failure_rate': backend.failures / backend.calls if backend.calls else 0.0}
+    report['config'] = {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}
+    if scheduler:
+        report['scheduler'] = scheduler.stats()
+        scheduler.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
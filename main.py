@@ -1,4 +1,5 @@
 from translator import NeuralTranslator, LANGUAGES, CODES_TO_LANGUAGES
+from planner import StrategyPlanner
 import sys
 import os
 
@@ -15,6 +16,7 @@ def main():
         pass
     
     translator = NeuralTranslator()
+    planner = StrategyPlanner(translator)
     
     print("=" * 80)
     print("  MULTILINGUAL NEURAL TRANSLATOR")
@@ -138,87 +140,60 @@ def main():
         
         print(f"\nTranslating to {supported_langs[dest_lang]}...")
         
-        # Automatically use sentence mode for mixed languages
-        use_split_mode = split_mode
-        if lang_detection.get('is_mixed', False) and lang_detection.get('count', 0) > 1:
-            use_split_mode = True
-            if not split_mode:
-                print("(Automatically using Sentence Mode for mixed languages)")
+        # Pick the cheapest strategy that handles this input correctly
+        decision = planner.plan(text, dest=dest_lang, prefer='sentences' if split_mode else None,
+                                detection=lang_detection)
+        strategy = decision['strategy']
+        print(f"Strategy: {strategy} ({decision['reason']})")
         
         # Recommend mode for Indian languages
         indian_lang_codes = ['hi', 'mr', 'kn', 'ta', 'te', 'gu', 'bn', 'pa', 'ml', 'or', 'as']
-        if dest_lang in indian_lang_codes and use_split_mode and not lang_detection.get('is_mixed', False):
+        if dest_lang in indian_lang_codes and strategy == 'sentences' and not lang_detection.get('is_mixed', False):
             print("Tip: Using Whole Text Mode gives better results for Indian languages")
         
         try:
-            # Check if text is romanized (Latin characters only)
-            is_romanized = all(ord(c) < 128 or c.isspace() or c in ',.!?;-' for c in text)
-            
-            # Detected languages from analysis
-            detected_langs = [lang['code'] for lang in lang_detection.get('languages', [])]
-            
-            # Indian languages that support transliteration
-            indian_langs = ['hi', 'mr', 'bn', 'gu', 'pa', 'or', 'ta', 'te', 'kn', 'ml', 'ne', 'sa']
-            has_indian_lang = any(lang in indian_langs for lang in detected_langs)
-            
-            # Use transliteration if:
-            # 1. Text is romanized (Latin only) AND
-            # 2. Detected language is an Indian language
-            use_transliteration = is_romanized and has_indian_lang
-            
-            # Aggressively use Smart Mode for:
-            # 1. Romanized Indian languages
-            # 2. Mixed languages
-            # 3. Any long romanized text (likely to be mixed/code-switched)
-            word_count = len(text.split())
-            use_smart_mode = use_transliteration or \
-                             (lang_detection.get('is_mixed', False) and lang_detection.get('count', 0) > 1) or \
-                             (is_romanized and word_count > 4)
-
-            if use_smart_mode:
-                # Show which Indian language was detected
-                if use_transliteration:
-                    detected_indian_langs = [lang for lang in detected_langs if lang in indian_langs]
-                    lang_names = [CODES_TO_LANGUAGES.get(code, code).title() for code in detected_indian_langs]
-                    
-                    if lang_names:
-                        lang_str = ", ".join(lang_names)
-                        print(f"✨ Romanized {lang_str} detected - using Smart Segmented Translation!")
-                    else:
-                        print("✨ Romanized Indian language detected - using Smart Segmented Translation!")
-                else:
-                    print("✨ Mixed languages detected - using Smart Segmented Translation!")
-                
-                # Use the new Smart Segmented Translation
-                result = translator.translate_smart(text, dest=dest_lang)
-                used_langs = detected_langs # Approximate for display
-            else:
-                # Standard translation
-                result = translator.translate(text, dest=dest_lang, src='auto', split_sentences=use_split_mode)
+            if strategy in ('whole', 'sentences'):
+                # Standard translation, printed sentence by sentence as soon as each one is ready
+                print(f"\n{'='*80}")
+                print(f"Original:    {text}")
+                print("Translated:  ", end="", flush=True)
+                for segment in translator.iter_translate(text, dest=dest_lang, src='auto',
+                                                         split_sentences=strategy == 'sentences'):
+                    print(segment['translation'], end="", flush=True)
+                print()
                 # Detect source language separately
                 detection = translator.detect_language(text)
                 used_langs = [detection] if detection and not detection.startswith("Error") else []
-            
-            if result.startswith("Error:"):
-                print(f"\nERROR: {result}")
             else:
+                if decision['analysis']['indian_languages'] and decision['analysis']['romanized']:
+                    lang_names = [CODES_TO_LANGUAGES.get(code, code).title()
+                                  for code in decision['analysis']['indian_languages']]
+                    print(f"✨ Romanized {', '.join(lang_names)} detected - transliterating to native script")
+                
+                result, used_langs = planner.execute(decision, text, dest=dest_lang)
+                
+                if result.startswith("Error:"):
+                    print(f"\nERROR: {result}")
+                    continue
+                
                 print(f"\n{'='*80}")
                 print(f"Original:    {text}")
                 print(f"Translated:  {result}")
-                print(f"Target:      {supported_langs.get(dest_lang, dest_lang)} ({dest_lang})")
-                print(f"{'='*80}")
-                
-                # Show all detected languages
-                if used_langs:
-                    # Filter out 'auto' or None
-                    valid_langs = [l for l in used_langs if l and l != 'auto']
-                    if valid_langs:
-                        lang_names = [f"{LANGUAGES.get(code, code).title()} ({code})" for code in valid_langs]
-                        print(f"Detected source: {', '.join(lang_names)}")
-                    else:
-                        print(f"Detected source: Unknown")
+            
+            print(f"Target:      {supported_langs.get(dest_lang, dest_lang)} ({dest_lang})")
+            print(f"{'='*80}")
+            
+            # Show all detected languages
+            if used_langs:
+                # Filter out 'auto' or None
+                valid_langs = [l for l in used_langs if l and l != 'auto']
+                if valid_langs:
+                    lang_names = [f"{LANGUAGES.get(code, code).title()} ({code})" for code in valid_langs]
+                    print(f"Detected source: {', '.join(lang_names)}")
                 else:
                     print(f"Detected source: Unknown")
+            else:
+                print(f"Detected source: Unknown")
                     
         except Exception as e:
             print(f"\nERROR: An error occurred: {str(e)}")
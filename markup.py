@@ -0,0 +1,392 @@
+"""
+Markup-aware (HTML / Markdown) translation.
+
+The document is parsed incrementally into translatable text units (one per
+block: paragraph, list item, heading, table cell...). Inline tags, entities,
+URLs and code spans inside a unit are replaced with numbered placeholders so
+the backend only sees text, all units are packed into as few requests as
+possible with translate_batch, and the document is rebuilt from the original
+source so everything outside the text stays byte for byte the same.
+"""
+import os
+import re
+import sys
+from html.parser import HTMLParser
+from translator import NeuralTranslator
+
+PLACEHOLDER = '⟦{}⟧'
+PLACEHOLDER_PATTERN = re.compile(r'⟦\s*(\d+)\s*⟧')
+URL_PATTERN = re.compile(r'(?:https?://|www\.)[^\s<>"\'()\[\]]+')
+
+# Elements whose content is never translated
+SKIP_TAGS = ['script', 'style', 'pre', 'textarea', 'svg', 'math', 'template']
+
+# Elements that stay inside a text unit (everything else starts a new unit)
+INLINE_TAGS = ['a', 'abbr', 'b', 'bdi', 'bdo', 'br', 'cite', 'code', 'data', 'del', 'dfn', 'em', 'font', 'i',
+               'img', 'ins', 'kbd', 'mark', 'q', 's', 'samp', 'small', 'span', 'strong', 'sub', 'sup', 'time',
+               'u', 'var', 'wbr']
+
+# Markdown: line prefixes (quotes, headings, list markers) and inline syntax to protect
+MD_PREFIX = re.compile(r'^(\s*(?:>\s*)*(?:#{1,6}\s+|[-*+]\s+(?:\[[ xX]\]\s+)?|\d+[.)]\s+)?)')
+MD_FENCE = re.compile(r'^\s*(```|~~~)')
+MD_QUOTE = re.compile(r'\s*(?:>\s*)*')
+MD_LINK_DEFINITION = re.compile(r'^\s*\[[^\]]+\]:\s*\S+')
+MD_PROTECTED = re.compile(
+    r'(`+)[^`]*?\1'                       # code spans
+    r'|!\[[^\]]*\]\([^)]*\)'              # images
+    r'|\]\([^)]*\)|\]\[[^\]]*\]|\['       # link targets and brackets
+    r'|\]'
+    r'|<[^>\s][^>]*>'                     # inline HTML and autolinks
+    r'|(?:https?://|www\.)[^\s<>()\[\]]+'  # bare URLs
+    r'|\*{1,3}|_{2,3}|~~|\|'              # emphasis markers, table pipes
+    r'|&#?\w+;'                           # entities
+)
+
+
+class _Document:
+    """
+    Source pieces in order: raw strings that are copied unchanged and
+    indices into the list of translatable units.
+    """
+    def __init__(self):
+        self.pieces = []
+        self.units = []
+        self._current = []
+
+    def raw(self, s):
+        self.end_unit()
+        self.pieces.append(s)
+
+    def keep(self, s):
+        self._current.append(('keep', s))
+
+    def text(self, s):
+        # URLs in running text are protected like inline tags
+        pos = 0
+        for match in URL_PATTERN.finditer(s):
+            if match.start() > pos:
+                self._current.append(('text', s[pos:match.start()]))
+            self._current.append(('keep', match.group()))
+            pos = match.end()
+        if pos < len(s):
+            self._current.append(('text', s[pos:]))
+
+    def end_unit(self):
+        unit = self._current
+        self._current = []
+        if not unit:
+            return
+
+        words = [i for i, (kind, s) in enumerate(unit) if kind == 'text' and any(c.isalpha() for c in s)]
+        if not words:
+            self.pieces.append("".join(s for _, s in unit))
+            return
+
+        # Leading/trailing tags and whitespace stay outside the translated text
+        first = min(i for i, (kind, s) in enumerate(unit) if kind == 'text' and s.strip())
+        last = max(i for i, (kind, s) in enumerate(unit) if kind == 'text' and s.strip())
+        lead = "".join(s for _, s in unit[:first])
+        trail = "".join(s for _, s in unit[last + 1:])
+        body = unit[first:last + 1]
+        s = body[0][1]
+        lead += s[:len(s) - len(s.lstrip())]
+        body[0] = ('text', s.lstrip())
+        s = body[-1][1]
+        trail = s[len(s.rstrip()):] + trail
+        body[-1] = ('text', s.rstrip())
+
+        # Merge adjacent protected pieces into one placeholder
+        merged = []
+        for kind, s in body:
+            if merged and kind == merged[-1][0] == 'keep':
+                merged[-1] = ('keep', merged[-1][1] + s)
+            else:
+                merged.append((kind, s))
+
+        if lead:
+            self.pieces.append(lead)
+        self.pieces.append(len(self.units))
+        self.units.append(merged)
+        if trail:
+            self.pieces.append(trail)
+
+
+class _HTMLTokenizer(HTMLParser):
+    """
+    Records where every token starts so the raw source of each token
+    (exact bytes, including attribute quoting and case) can be sliced out.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.events = []
+
+    def _event(self, kind, tag=None):
+        self.events.append((kind, tag, self.getpos()))
+
+    def handle_starttag(self, tag, attrs):
+        self._event('start', tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._event('startend', tag)
+
+    def handle_endtag(self, tag):
+        self._event('end', tag)
+
+    def handle_data(self, data):
+        self._event('data')
+
+    def handle_entityref(self, name):
+        self._event('entity')
+
+    def handle_charref(self, name):
+        self._event('entity')
+
+    def handle_comment(self, data):
+        self._event('comment')
+
+    def handle_decl(self, decl):
+        self._event('decl')
+
+    def handle_pi(self, data):
+        self._event('decl')
+
+    def unknown_decl(self, data):
+        self._event('decl')
+
+
+def _chunks(source, size=65536):
+    # Accept a string, a file object or any iterable of strings
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from source
+
+
+class MarkupTranslator:
+    def __init__(self, translator=None):
+        self.translator = translator or NeuralTranslator()
+
+    def parse_html(self, source):
+        """
+        Parse HTML (string, file or iterable of chunks) into a _Document.
+        """
+        tokenizer = _HTMLTokenizer()
+        chunks = []
+        for chunk in _chunks(source):
+            chunks.append(chunk)
+            tokenizer.feed(chunk)
+        tokenizer.close()
+        html = "".join(chunks)
+
+        # Convert (line, column) token positions to offsets
+        line_starts = [0] + [m.end() for m in re.finditer('\n', html)]
+        offsets = [line_starts[line - 1] + col for _, _, (line, col) in tokenizer.events]
+        offsets.append(len(html))
+
+        doc = _Document()
+        if offsets[0] > 0:
+            doc.raw(html[:offsets[0]])
+
+        skip_tag = None
+        code_depth = 0
+        for (kind, tag, _), start, end in zip(tokenizer.events, offsets, offsets[1:]):
+            raw = html[start:end]
+            if skip_tag:
+                doc.pieces.append(raw)
+                if kind == 'end' and tag == skip_tag:
+                    skip_tag = None
+                continue
+
+            if kind == 'data':
+                if code_depth:
+                    doc.keep(raw)
+                else:
+                    doc.text(raw)
+            elif kind in ('entity', 'comment'):
+                doc.keep(raw)
+            elif kind == 'decl':
+                doc.raw(raw)
+            elif tag in SKIP_TAGS:
+                doc.raw(raw)
+                if kind == 'start':
+                    skip_tag = tag
+            elif tag in INLINE_TAGS:
+                doc.keep(raw)
+                if tag == 'code' and kind == 'start':
+                    code_depth += 1
+                elif tag == 'code' and kind == 'end' and code_depth:
+                    code_depth -= 1
+            else:
+                doc.raw(raw)
+        doc.end_unit()
+        return doc
+
+    def parse_markdown(self, source):
+        """
+        Parse Markdown (string, file or iterable of chunks) line by line into a _Document.
+        """
+        doc = _Document()
+        state = (None, True, None)
+        pending = ""
+        for chunk in _chunks(source):
+            lines = (pending + chunk).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                state = self._markdown_line(doc, line + '\n', *state)
+        if pending:
+            self._markdown_line(doc, pending, *state)
+        doc.end_unit()
+        return doc
+
+    def _markdown_line(self, doc, line, fence, previous_blank, paragraph):
+        """
+        Add one source line to doc. Returns the state for the next line:
+        (open fence, previous line blank, quote markers of the open paragraph or None).
+        Consecutive lines of a paragraph form one unit; the line break between
+        them is kept as a protected piece.
+        """
+        fence_match = MD_FENCE.match(line)
+        if fence:
+            doc.raw(line)
+            if fence_match and fence_match.group(1) == fence:
+                fence = None
+            return fence, False, None
+        if fence_match:
+            doc.raw(line)
+            return fence_match.group(1), False, None
+
+        is_blank = not line.strip()
+        indented_code = previous_blank and (line.startswith('    ') or line.startswith('\t'))
+        # Lines without letters (rules, setext underlines, table separators) end the paragraph
+        no_text = not any(c.isalpha() for c in line)
+        if is_blank or indented_code or no_text or MD_LINK_DEFINITION.match(line):
+            doc.raw(line)
+            return None, is_blank or indented_code, None
+
+        prefix = MD_PREFIX.match(line).group(1)
+        quote = MD_QUOTE.match(prefix).group()
+        marker = prefix[len(quote):]
+        quote_level = quote.count('>')
+        body = line[len(prefix):]
+        content = body.rstrip()
+        line_break = body[len(content):]
+        table_row = '|' in content
+
+        if paragraph is not None and not marker and not table_row and quote_level == paragraph:
+            # Continuation line: stays in the open unit
+            if prefix:
+                doc.keep(prefix)
+        elif prefix:
+            doc.raw(prefix)
+        else:
+            doc.end_unit()
+
+        pos = 0
+        for match in MD_PROTECTED.finditer(content):
+            if match.start() > pos:
+                doc.text(content[pos:match.start()])
+            if match.group() == '|':
+                # Table cells are translated as separate units
+                doc.raw('|')
+            else:
+                doc.keep(match.group())
+            pos = match.end()
+        if pos < len(content):
+            doc.text(content[pos:])
+
+        if table_row or marker.lstrip().startswith('#'):
+            # Table rows and headings are single-line blocks
+            if line_break:
+                doc.raw(line_break)
+            doc.end_unit()
+            return None, False, None
+        if line_break:
+            doc.keep(line_break)
+        return None, False, quote_level
+
+    def render(self, doc, dest='en', src='auto'):
+        """
+        Translate every unit of a parsed document and rebuild it.
+        """
+        sources = []
+        for unit in doc.units:
+            keep_index = 0
+            parts = []
+            for kind, s in unit:
+                if kind == 'keep':
+                    parts.append(PLACEHOLDER.format(keep_index))
+                    keep_index += 1
+                else:
+                    parts.append(s)
+            sources.append("".join(parts))
+
+        translations = self.translator.translate_batch(sources, dest=dest, src=src)
+        rendered = [self._restore(unit, translation) for unit, translation in zip(doc.units, translations)]
+
+        # Units whose placeholders did not survive: translate their text pieces on their own
+        failed = [i for i, r in enumerate(rendered) if r is None]
+        if failed:
+            texts = [s.strip() for i in failed for kind, s in doc.units[i] if kind == 'text']
+            results = iter(self.translator.translate_batch(texts, dest=dest, src=src))
+            for i in failed:
+                parts = []
+                for kind, s in doc.units[i]:
+                    if kind == 'text' and s.strip():
+                        leading = s[:len(s) - len(s.lstrip())]
+                        trailing = s[len(s.rstrip()):]
+                        parts.append(leading + next(results) + trailing)
+                    elif kind == 'text':
+                        next(results)
+                        parts.append(s)
+                    else:
+                        parts.append(s)
+                rendered[i] = "".join(parts)
+
+        return "".join(rendered[p] if isinstance(p, int) else p for p in doc.pieces)
+
+    def _restore(self, unit, translation):
+        kept = [s for kind, s in unit if kind == 'keep']
+        found = [int(n) for n in PLACEHOLDER_PATTERN.findall(translation)]
+        if sorted(found) != list(range(len(kept))):
+            return None
+        return PLACEHOLDER_PATTERN.sub(lambda m: kept[int(m.group(1))], translation)
+
+    def translate_html(self, source, dest='en', src='auto'):
+        """
+        Translate the text of an HTML document, leaving markup untouched.
+        """
+        return self.render(self.parse_html(source), dest=dest, src=src)
+
+    def translate_markdown(self, source, dest='en', src='auto'):
+        """
+        Translate the text of a Markdown document, leaving syntax and code untouched.
+        """
+        return self.render(self.parse_markdown(source), dest=dest, src=src)
+
+    def translate_file(self, input_path, output_path, dest='en', src='auto'):
+        """
+        Translate an .html/.htm or .md/.markdown file.
+        """
+        extension = os.path.splitext(input_path)[1].lower()
+        with open(input_path, encoding='utf-8', newline='') as infile:
+            if extension in ('.md', '.markdown'):
+                result = self.translate_markdown(infile, dest=dest, src=src)
+            else:
+                result = self.translate_html(infile, dest=dest, src=src)
+        with open(output_path, 'w', encoding='utf-8', newline='') as outfile:
+            outfile.write(result)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python markup.py <input.html|input.md> <output> <target_lang> [source_lang]")
+        sys.exit(1)
+    source = sys.argv[4] if len(sys.argv) > 4 else 'auto'
+    MarkupTranslator().translate_file(sys.argv[1], sys.argv[2], dest=sys.argv[3], src=source)
+    print(f"Translated document written to {sys.argv[2]}")
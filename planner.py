@@ -0,0 +1,207 @@
+"""
+Strategy planner: picks the translation path for an input.
+
+NeuralTranslator has several ways to translate the same text (whole text,
+sentence by sentence, comma-level mixed mode, smart segmented mode and
+per-segment transliteration). They differ in how many backend requests and
+characters they cost and in which inputs they handle correctly. The planner
+analyses the input locally, estimates requests, characters and latency of
+every strategy from the cache and the translator's recorded backend
+latencies, drops the strategies the quality rules forbid, and chooses the
+cheapest of the rest. The decision (with all estimates) is returned so
+callers can show or log why a path was taken.
+"""
+import re
+import unicodedata
+from translator import INDIAN_LANGS, TRANSLITERATION_AVAILABLE, is_romanized
+
+# Tie-break order when estimates are equal
+STRATEGIES = ['whole', 'smart', 'sentences', 'mixed', 'transliteration']
+
+# Segment languages translate_smart transliterates to native script
+SMART_TRANSLITERATED = ['hi', 'kn', 'mr', 'gu', 'pa', 'ta', 'te', 'bn', 'ml']
+
+
+def _scripts(text):
+    # Unicode script of every letter, e.g. {'LATIN', 'DEVANAGARI'}
+    scripts = set()
+    for c in text:
+        if c.isalpha():
+            scripts.add(unicodedata.name(c, 'UNKNOWN').split(' ')[0])
+    return scripts
+
+
+class StrategyPlanner:
+    def __init__(self, translator):
+        self.translator = translator
+
+    def analyse(self, text, detection=None):
+        """
+        Local analysis of the input (no backend requests).
+        detection: optional result of detect_mixed_languages() to reuse.
+        """
+        if detection and not detection.get('error'):
+            langs = set(lang['code'] for lang in detection.get('languages', []))
+        else:
+            langs = self.translator._pattern_languages(text)
+        scripts = _scripts(text)
+        romanized = is_romanized(text)
+        return {
+            'romanized': romanized,
+            'languages': sorted(langs),
+            'indian_languages': sorted(lang for lang in langs if lang in INDIAN_LANGS),
+            'scripts': sorted(scripts),
+            'is_mixed': len(langs) > 1 or len(scripts) > 1,
+            'word_count': len(text.split()),
+            'chars': len(text),
+        }
+
+    def _requests(self, pieces, dest, src='auto'):
+        # (uncached requests, characters) for translating each piece on its own
+        cache = self.translator.cache
+        missing = [p for p in pieces if cache.get(('translate', src, dest, p)) is None]
+        return len(missing), sum(len(p) for p in missing)
+
+    def estimate(self, text, dest):
+        """
+        Estimated backend requests, characters and latency of every strategy.
+        """
+        translator = self.translator
+        latency = translator.backend_latency
+        low = translator._budget_low('translate', dest)
+        estimates = {}
+
+        # Whole text: one request
+        calls, chars = self._requests([text], dest)
+        estimates['whole'] = {'translate': calls, 'chars': chars}
+
+        # Sentence mode sends every sentence and punctuation run
+        parts = [p.strip() for p in re.split(r'([.!?。;]+)', text) if p.strip()]
+        if low:
+            parts = [p for p in parts if any(c.isalnum() for c in p)]
+        calls, chars = self._requests(parts, dest)
+        estimates['sentences'] = {'translate': calls, 'chars': chars}
+
+        # Mixed mode sends every clause between , . ! ? ;
+        clauses = [p.strip() for p in re.split(r'([,.!?;]+)', text)
+                   if p.strip() and p.strip() not in ',.!?;']
+        calls, chars = self._requests(clauses, dest)
+        estimates['mixed'] = {'translate': calls, 'chars': chars}
+
+        # Smart mode: transliterate Indian segments, then one request for the whole sentence
+        translit = 0
+        translit_chars = 0
+        if TRANSLITERATION_AVAILABLE:
+            for seg in translator._segment_smart(text):
+                if seg['lang'] in SMART_TRANSLITERATED and \
+                        translator.cache.get(('transliterate', seg['lang'], seg['text'])) is None:
+                    translit += 1
+                    translit_chars += len(seg['text'])
+        estimates['smart'] = {'translate': 1, 'transliterate': translit, 'chars': len(text) + translit_chars}
+
+        # Transliteration mode: one batched detection, then per clause transliterate + translate
+        unresolved = []
+        translit = 0
+        translit_chars = 0
+        for clause in clauses:
+            lang, _ = translator._detect_local(clause)
+            if lang is None and translator.cache.get(('detect', clause)) is None:
+                unresolved.append(clause)
+            if TRANSLITERATION_AVAILABLE and is_romanized(clause) and lang in INDIAN_LANGS:
+                translit += 1
+                translit_chars += len(clause)
+        detect_calls = 1 if unresolved and not translator._budget_low('detect') else 0
+        detect_chars = sum(len(c) for c in unresolved) if detect_calls else 0
+        estimates['transliteration'] = {
+            'detect': detect_calls,
+            'transliterate': translit,
+            'translate': len(clauses),
+            'chars': sum(len(c) for c in clauses) + detect_chars + translit_chars,
+        }
+
+        for estimate in estimates.values():
+            estimate['requests'] = sum(estimate.get(kind, 0) for kind in ('translate', 'detect', 'transliterate'))
+            estimate['latency'] = sum(estimate.get(kind, 0) * latency.get(kind, 0)
+                                      for kind in ('translate', 'detect', 'transliterate'))
+        return estimates
+
+    def _rules(self, analysis):
+        """
+        Strategies allowed for the input, with the rule that restricted them.
+        """
+        allowed = set(STRATEGIES)
+        rules = []
+        if not analysis['romanized']:
+            # translate_smart forces source='en' for Hindi targets; only valid for romanized input
+            allowed.discard('smart')
+        if analysis['romanized'] and analysis['indian_languages']:
+            allowed &= {'smart', 'transliteration'}
+            rules.append("romanized Indian language: needs transliteration to native script")
+        elif analysis['romanized'] and analysis['word_count'] > 4:
+            allowed &= {'smart', 'transliteration'}
+            rules.append("long romanized text: treated as possibly code-switched")
+        if analysis['is_mixed']:
+            allowed.discard('whole')
+            rules.append("mixed languages: translate per segment")
+        return allowed, rules
+
+    def plan(self, text, dest='en', prefer=None, detection=None):
+        """
+        Choose a strategy for text -> dest and explain the decision.
+        prefer: strategy to use if the quality rules allow it (e.g. the user's mode).
+        """
+        analysis = self.analyse(text, detection)
+        estimates = self.estimate(text, dest)
+        allowed, rules = self._rules(analysis)
+
+        # When the character budget is low, characters matter more than speed
+        low = self.translator._budget_low('translate', dest)
+        def cost(strategy):
+            e = estimates[strategy]
+            primary = (e['chars'], e['latency']) if low else (e['latency'], e['chars'])
+            return primary + (STRATEGIES.index(strategy),)
+
+        candidates = sorted(allowed, key=cost)
+        if prefer in allowed:
+            strategy = prefer
+            reason = f"'{prefer}' requested"
+        else:
+            strategy = candidates[0]
+            reason = "cheapest by " + ("characters (budget low)" if low else "expected latency")
+        if rules:
+            reason += "; " + "; ".join(rules)
+
+        return {
+            'strategy': strategy,
+            'reason': reason,
+            'estimate': estimates[strategy],
+            'estimates': estimates,
+            'allowed': [s for s in STRATEGIES if s in allowed],
+            'analysis': analysis,
+        }
+
+    def execute(self, decision, text, dest='en'):
+        """
+        Run the chosen strategy. Returns (translation, detected source languages).
+        """
+        translator = self.translator
+        strategy = decision['strategy']
+        langs = decision['analysis']['languages']
+        if strategy == 'whole':
+            return translator.translate(text, dest=dest, split_sentences=False), langs
+        if strategy == 'sentences':
+            return translator.translate(text, dest=dest, split_sentences=True), langs
+        if strategy == 'mixed':
+            return translator.translate_mixed_text(text, dest=dest), langs
+        if strategy == 'smart':
+            return translator.translate_smart(text, dest=dest), langs
+        return translator.translate_with_transliteration(text, dest=dest)
+
+    def translate(self, text, dest='en', prefer=None, detection=None):
+        """
+        Plan and execute. Returns (translation, decision).
+        """
+        decision = self.plan(text, dest=dest, prefer=prefer, detection=detection)
+        translation, langs = self.execute(decision, text, dest=dest)
+        decision['detected'] = langs
+        return translation, decision
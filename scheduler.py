@@ -0,0 +1,186 @@
+"""
+Priority-aware request scheduler for backend calls.
+
+NeuralTranslator hands every backend request to a RequestScheduler when one
+is configured. Requests are queued by priority class (interactive before
+bulk), and within a class tenants/jobs share capacity by weighted fair
+queuing on request size (characters). Background classes can never occupy
+the slots reserved for interactive traffic, full queues shed load with
+QueueFullError, and per-class latency percentiles are kept for monitoring.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+# Lower rank is served first; rank 0 is the interactive class
+DEFAULT_PRIORITIES = {'interactive': 0, 'bulk': 1}
+
+DEFAULT_QUEUE_LIMITS = {'interactive': 200, 'bulk': 5000}
+
+# Latency samples kept per class for percentiles
+STATS_WINDOW = 10000
+
+
+class QueueFullError(Exception):
+    """
+    Raised by submit() when the queue for a priority class is full.
+    """
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RequestScheduler:
+    def __init__(self, concurrency=4, reserved_interactive=1, priorities=None, queue_limits=None):
+        """
+        concurrency: backend requests in flight at once.
+        reserved_interactive: slots that only the interactive class (rank 0) may use.
+        priorities: {class name: rank}; queue_limits: {class name: max queued requests}.
+        """
+        if reserved_interactive >= concurrency:
+            raise ValueError(f"reserved_interactive ({reserved_interactive}) must be less than "
+                             f"concurrency ({concurrency}) so background classes get a slot")
+        self.concurrency = concurrency
+        self.background_limit = concurrency - reserved_interactive
+        self.priorities = dict(priorities or DEFAULT_PRIORITIES)
+        self.queue_limits = dict(DEFAULT_QUEUE_LIMITS, **(queue_limits or {}))
+        self.weights = {}
+
+        self._cond = threading.Condition()
+        self._heap = []
+        self._sequence = itertools.count()
+        self._virtual_time = {name: 0.0 for name in self.priorities}
+        self._last_finish = {}
+        self._queued = {name: 0 for name in self.priorities}
+        self._running_background = 0
+        self._closed = False
+        self._stats = {name: {'completed': 0, 'failed': 0, 'shed': 0,
+                              'wait': deque(maxlen=STATS_WINDOW), 'latency': deque(maxlen=STATS_WINDOW)}
+                       for name in self.priorities}
+
+        self._workers = [threading.Thread(target=self._work, daemon=True) for _ in range(concurrency)]
+        for worker in self._workers:
+            worker.start()
+
+    def set_weight(self, tenant, weight):
+        """
+        Share of its class a tenant/job gets relative to others (default 1).
+        """
+        with self._cond:
+            self.weights[tenant] = float(weight)
+
+    def submit(self, fn, *args, priority='interactive', tenant='default', cost=1, **kwargs):
+        """
+        Queue fn(*args, **kwargs) and return a Future for its result.
+        """
+        if priority not in self.priorities:
+            raise ValueError(f"Unknown priority class '{priority}'")
+
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler has been shut down")
+            if self._queued[priority] >= self.queue_limits.get(priority, float('inf')):
+                self._stats[priority]['shed'] += 1
+                raise QueueFullError(f"{priority} queue is full ({self._queued[priority]} requests waiting)")
+
+            # Weighted fair queuing: finish tag grows by cost / weight per tenant
+            key = (priority, tenant)
+            start = max(self._virtual_time[priority], self._last_finish.get(key, 0.0))
+            finish = start + max(cost, 1) / self.weights.get(tenant, 1.0)
+            self._last_finish[key] = finish
+
+            entry = (self.priorities[priority], finish, next(self._sequence),
+                     priority, fn, args, kwargs, future, time.monotonic())
+            heapq.heappush(self._heap, entry)
+            self._queued[priority] += 1
+            self._cond.notify()
+        return future
+
+    def run(self, fn, *args, priority='interactive', tenant='default', cost=1, **kwargs):
+        """
+        Submit and wait for the result (exceptions are re-raised).
+        """
+        return self.submit(fn, *args, priority=priority, tenant=tenant, cost=cost, **kwargs).result()
+
+    def _next(self):
+        # Called with the lock held. Background classes may not use reserved slots.
+        if not self._heap:
+            return None
+        if self._heap[0][0] > 0 and self._running_background >= self.background_limit:
+            return None
+        return heapq.heappop(self._heap)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                entry = self._next()
+                while entry is None:
+                    if self._closed and not self._heap:
+                        return
+                    self._cond.wait()
+                    entry = self._next()
+                rank, finish, _, priority, fn, args, kwargs, future, queued_at = entry
+                self._queued[priority] -= 1
+                self._virtual_time[priority] = finish
+                if rank > 0:
+                    self._running_background += 1
+
+            started = time.monotonic()
+            failed = False
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    failed = True
+                    future.set_exception(e)
+            done = time.monotonic()
+
+            with self._cond:
+                if rank > 0:
+                    self._running_background -= 1
+                stats = self._stats[priority]
+                stats['failed' if failed else 'completed'] += 1
+                stats['wait'].append(started - queued_at)
+                stats['latency'].append(done - queued_at)
+                self._cond.notify_all()
+
+    def stats(self):
+        """
+        Per-class counters and latency percentiles (seconds, queue wait included).
+        """
+        with self._cond:
+            report = {}
+            for name, stats in self._stats.items():
+                wait = sorted(stats['wait'])
+                latency = sorted(stats['latency'])
+                report[name] = {
+                    'queued': self._queued[name],
+                    'completed': stats['completed'],
+                    'failed': stats['failed'],
+                    'shed': stats['shed'],
+                    'wait_p50': _percentile(wait, 0.50),
+                    'wait_p99': _percentile(wait, 0.99),
+                    'latency_p50': _percentile(latency, 0.50),
+                    'latency_p95': _percentile(latency, 0.95),
+                    'latency_p99': _percentile(latency, 0.99),
+                }
+            return report
+
+    def shutdown(self, wait=True):
+        """
+        Stop accepting requests; queued requests are still executed.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
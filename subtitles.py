@@ -0,0 +1,153 @@
+"""
+Subtitle (SRT / WebVTT) translation.
+
+Cues are read from the input file one block at a time and translated in
+windows of many cues, so a long file costs a few dozen backend requests
+instead of one per cue. Cue numbers, timestamps, settings and the VTT
+header/NOTE/STYLE blocks are written back untouched.
+"""
+import re
+import sys
+from translator import NeuralTranslator, MAX_BATCH_CHARS
+
+# Cue text translated per window (about two packed backend requests)
+WINDOW_CHARS = MAX_BATCH_CHARS * 2
+
+# Leading formatting ("<v Speaker>", "<i>", "{\an8}", "- ") and trailing closing tags
+TAGS = r'(?:(?:<[^>]*>|\{[^}]*\})\s*)*'
+LINE_PATTERN = re.compile(r'^(\s*' + TAGS + r'(?:-\s*)?' + TAGS + r')(.*?)((?:\s*<[^>]*>)*\s*)$')
+
+
+def read_blocks(lines):
+    """
+    Yield blocks of lines separated by blank lines.
+    """
+    block = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def parse_block(block):
+    """
+    Split a block into its untouched head (index, timing) and its text lines.
+    Blocks without a timing line (WEBVTT header, NOTE, STYLE) have no text.
+    """
+    for i, line in enumerate(block):
+        if '-->' in line:
+            return {'head': block[:i + 1], 'lines': block[i + 1:]}
+    return {'head': block, 'lines': []}
+
+
+def _rewrap(text, count):
+    # Spread translated words over at most as many lines as the original cue;
+    # never returns empty lines (a blank line would end the cue)
+    words = text.split()
+    if count <= 1 or len(words) <= 1:
+        return [text]
+    target = len(text) / count
+    lines = []
+    current = []
+    for word in words:
+        remaining_lines = count - len(lines)
+        if current and remaining_lines > 1 and len(" ".join(current + [word])) > target:
+            lines.append(" ".join(current))
+            current = []
+        current.append(word)
+    lines.append(" ".join(current))
+    return lines
+
+
+class SubtitleTranslator:
+    def __init__(self, translator=None):
+        self.translator = translator or NeuralTranslator()
+        # Backend failures in the last translate_lines() run (those cues were left untranslated)
+        self.failures = 0
+
+    def _units(self, cue):
+        # Translation units for a cue: one per dialogue line, otherwise the whole cue
+        parts = [LINE_PATTERN.match(line).groups() for line in cue['lines']]
+        dialogue = len(parts) > 1 and any(prefix.strip().endswith('-') for prefix, _, _ in parts)
+        if dialogue:
+            return [{'text': part[1], 'parts': [part]} for part in parts]
+        return [{'text': " ".join(body for _, body, _ in parts if body), 'parts': parts}]
+
+    def _translate_window(self, cues, dest, src):
+        units = [unit for cue in cues for unit in cue['units']]
+        with self.translator.meter.track() as usage:
+            results = self.translator.translate_many([unit['text'] for unit in units], dest=dest, src=src)
+        self.failures += usage['fallbacks']
+        for unit, result in zip(units, results):
+            unit['translation'] = result
+
+    def _render(self, cue):
+        lines = list(cue['head'])
+        for unit in cue['units']:
+            parts = unit['parts']
+            if not unit['text'].strip() or not unit['translation'].strip():
+                # Nothing to translate, or an empty answer: keep the original lines
+                lines.extend(prefix + body + suffix for prefix, body, suffix in parts)
+                continue
+            wrapped = _rewrap(unit['translation'], len(parts))
+            for n, text in enumerate(wrapped):
+                prefix, _, suffix = parts[n]
+                if n == len(wrapped) - 1:
+                    # The last line keeps the cue's closing tags
+                    suffix = parts[-1][2]
+                lines.append(prefix + text + suffix)
+        return lines
+
+    def translate_lines(self, lines, dest='en', src='auto'):
+        """
+        Translate subtitle lines (SRT or VTT) and yield the output lines.
+        Input is consumed lazily; output is produced one window of cues at a time.
+        """
+        self.failures = 0
+        window = []
+        size = 0
+        for block in read_blocks(lines):
+            cue = parse_block(block)
+            cue['units'] = self._units(cue) if cue['lines'] else []
+            window.append(cue)
+            size += sum(len(unit['text']) + 1 for unit in cue['units'])
+            if size >= WINDOW_CHARS:
+                yield from self._flush(window, dest, src)
+                window = []
+                size = 0
+        if window:
+            yield from self._flush(window, dest, src)
+
+    def _flush(self, window, dest, src):
+        self._translate_window(window, dest, src)
+        for cue in window:
+            yield from self._render(cue)
+            yield ''
+
+    def translate_file(self, input_path, output_path, dest='en', src='auto'):
+        """
+        Translate an .srt or .vtt file and write a subtitle file of the same format.
+        Returns the number of backend failures (cues kept in the source language).
+        """
+        with open(input_path, encoding='utf-8-sig') as infile, \
+             open(output_path, 'w', encoding='utf-8') as outfile:
+            for line in self.translate_lines(infile, dest=dest, src=src):
+                outfile.write(line + '\n')
+        return self.failures
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python subtitles.py <input.srt|input.vtt> <output> <target_lang> [source_lang]")
+        sys.exit(1)
+    source = sys.argv[4] if len(sys.argv) > 4 else 'auto'
+    failures = SubtitleTranslator().translate_file(sys.argv[1], sys.argv[2], dest=sys.argv[3], src=source)
+    if failures:
+        print(f"Error: {failures} backend request(s) failed; some cues in {sys.argv[2]} were left untranslated")
+        sys.exit(1)
+    print(f"Translated subtitles written to {sys.argv[2]}")
@@ -0,0 +1,256 @@
+"""
+Opt-in request tracing for NeuralTranslator.
+
+With a Tracer attached (NeuralTranslator(tracer=Tracer(...))) every public
+call records a span tree: analysis, detections, transliterations, each
+backend request with its size, queue wait and latency, cache hits, and the
+fallbacks taken by the except blocks. Requests slower than the threshold are
+kept in a ring buffer and optionally appended to a JSONL file, so slowdowns
+can be diagnosed after the fact. With profile_slowest=N the slowest N
+requests also carry a cProfile summary. Streaming calls (iter_translate and
+its variants) are traced from the first segment requested until the
+iterator finishes; they are not profiled.
+
+Without a tracer nothing is recorded; spans started outside a traced
+request are no-ops.
+"""
+import contextlib
+import contextvars
+import cProfile
+import functools
+import heapq
+import io
+import itertools
+import json
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+
+# Span of the traced call running in the current thread/task
+_current_span = contextvars.ContextVar('trace_span', default=None)
+
+
+def _new_span(name, attrs):
+    return {'name': name, 'attrs': attrs, 'start': time.monotonic(), 'duration': None,
+            'error': None, 'events': [], 'children': []}
+
+
+def _export(span, origin):
+    # JSON-friendly copy with start offsets relative to the request start
+    exported = {
+        'name': span['name'],
+        'offset': round(span['start'] - origin, 6),
+        'duration': round(span['duration'], 6) if span['duration'] is not None else None,
+    }
+    if span['attrs']:
+        exported['attrs'] = span['attrs']
+    if span['error']:
+        exported['error'] = span['error']
+    if span['events']:
+        exported['events'] = [dict(event, offset=round(event['offset'] - origin, 6)) for event in span['events']]
+    if span['children']:
+        exported['children'] = [_export(child, origin) for child in list(span['children'])]
+    return exported
+
+
+def _input_attrs(args):
+    # Size of the first argument: a text or a list of texts
+    if not args:
+        return {}
+    first = args[0]
+    if isinstance(first, str):
+        return {'chars': len(first)}
+    if isinstance(first, (list, tuple)):
+        return {'items': len(first), 'chars': sum(len(t) for t in first if isinstance(t, str))}
+    return {}
+
+
+def _error_of(result):
+    # The translator reports failures as "Error: ..." strings (or dicts with 'error')
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, str) and result.startswith("Error:"):
+        return result
+    if isinstance(result, dict) and result.get('error'):
+        return result['error']
+    return None
+
+
+def traced(name, root=True):
+    """
+    Decorator for NeuralTranslator methods. root=True starts a request
+    trace when none is running; otherwise the call becomes a child span.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.tracer is None:
+                return method(self, *args, **kwargs)
+            with self.tracer.span(name, root=root, **_input_attrs(args)) as span:
+                result = method(self, *args, **kwargs)
+                if span is not None:
+                    span['error'] = _error_of(result)
+                return result
+        return wrapper
+    return decorate
+
+
+class Tracer:
+    def __init__(self, threshold=1.0, buffer_size=100, path=None, profile_slowest=0, profile_lines=25):
+        """
+        threshold: requests taking at least this many seconds are sampled (0 = all).
+        buffer_size: sampled traces kept in memory (oldest are dropped).
+        path: optional JSONL file every sampled trace is appended to.
+        profile_slowest: keep a cProfile summary for the slowest N requests.
+            Every request is profiled while this is set, so it costs CPU.
+        """
+        self.threshold = threshold
+        self.path = path
+        self.profile_slowest = profile_slowest
+        self.profile_lines = profile_lines
+        self.samples = deque(maxlen=buffer_size)
+        self.requests = 0
+        self._slowest = []  # min-heap of (duration, trace id) of profiled samples
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, root=False, **attrs):
+        """
+        Record a span under the current one. Outside a request, root=True
+        starts a new request trace and root=False does nothing (yields None).
+        """
+        parent = _current_span.get()
+        if parent is None and not root:
+            yield None
+            return
+
+        span = _new_span(name, attrs)
+        if parent is not None:
+            parent['children'].append(span)
+        profiler = self._start_profile() if parent is None and self.profile_slowest else None
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span['duration'] = time.monotonic() - span['start']
+            _current_span.reset(token)
+            if parent is None:
+                self._finish(span, profiler)
+
+    def begin(self, name, context, **attrs):
+        """
+        Start a span that is current inside context (a contextvars.Context)
+        without touching the caller's context. Used by generators, which
+        yield to the consumer while the span stays open; work for the span
+        must run in context (or its copies). Finish it with end().
+        """
+        parent = context.get(_current_span)
+        span = _new_span(name, attrs)
+        span['root'] = parent is None
+        if parent is not None:
+            parent['children'].append(span)
+        context.run(_current_span.set, span)
+        return span
+
+    def end(self, span, error=None):
+        """
+        Finish a span started with begin(); a root span is sampled like span().
+        """
+        span['duration'] = time.monotonic() - span['start']
+        if error is not None:
+            span['error'] = f"{type(error).__name__}: {error}"
+        if span.pop('root'):
+            self._finish(span, None)
+
+    def event(self, name, **attrs):
+        """
+        Note something that happened in the current span (fallbacks, cache hits).
+        Inside an except block the exception being handled is recorded too.
+        """
+        span = _current_span.get()
+        if span is None:
+            return
+        error = sys.exc_info()[1]
+        if error is not None:
+            attrs['error'] = f"{type(error).__name__}: {error}"
+        span['events'].append(dict(attrs, name=name, offset=time.monotonic()))
+
+    def _start_profile(self):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active (Python 3.12+ allows one at a time)
+            return None
+        return profiler
+
+    def _finish(self, span, profiler):
+        if profiler is not None:
+            profiler.disable()
+        with self._lock:
+            self.requests += 1
+        if span['duration'] < self.threshold:
+            return
+
+        trace_id = next(self._ids)
+        sample = {'id': trace_id, 'time': time.time(), 'name': span['name'],
+                  'duration': round(span['duration'], 6), 'trace': _export(span, span['start'])}
+        if profiler is not None and self._keep_profile(span['duration'], trace_id):
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(self.profile_lines)
+            sample['profile'] = output.getvalue()
+
+        with self._lock:
+            self.samples.append(sample)
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+
+    def _keep_profile(self, duration, trace_id):
+        with self._lock:
+            if len(self._slowest) < self.profile_slowest:
+                heapq.heappush(self._slowest, (duration, trace_id))
+                return True
+            if duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (duration, trace_id))
+                return True
+            return False
+
+    def slowest(self, n=10):
+        """
+        The n slowest sampled requests still in the buffer, slowest first.
+        """
+        with self._lock:
+            return sorted(self.samples, key=lambda sample: sample['duration'], reverse=True)[:n]
+
+    def dump(self, path):
+        """
+        Write the buffered samples to a JSONL file. Returns the number written.
+        """
+        with self._lock:
+            samples = list(self.samples)
+        with open(path, 'w', encoding='utf-8') as f:
+            for sample in samples:
+                f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+        return len(samples)
+
+
+def format_trace(span, indent=0):
+    """
+    Readable text of an exported trace tree (sample['trace']).
+    """
+    attrs = " ".join(f"{key}={value}" for key, value in span.get('attrs', {}).items())
+    line = f"{'  ' * indent}{span['name']} +{span['offset'] * 1000:.1f}ms {(span['duration'] or 0) * 1000:.1f}ms"
+    lines = [line + (f" {attrs}" if attrs else "") + (f" ERROR {span['error']}" if span.get('error') else "")]
+    for event in span.get('events', []):
+        details = " ".join(f"{key}={value}" for key, value in event.items() if key not in ('name', 'offset'))
+        lines.append(f"{'  ' * (indent + 1)}! {event['name']} +{event['offset'] * 1000:.1f}ms {details}".rstrip())
+    for child in span.get('children', []):
+        lines.append(format_trace(child, indent + 1))
+    return "\n".join(lines)
@@ -1,6 +1,11 @@
 import re
 import sys
-from deep_translator import GoogleTranslator, single_detection
+import asyncio
+import contextlib
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from deep_translator import GoogleTranslator, single_detection, batch_detection
 from deep_translator import constants
 
 # Apply patch to support all 245+ languages
@@ -18,6 +23,11 @@ LANGUAGES = constants.GOOGLE_LANGUAGES_TO_CODES
 # Create reverse mapping (Code -> Name) for lookups
 CODES_TO_LANGUAGES = {v: k for k, v in LANGUAGES.items()}
 
+from accounting import CharacterMeter, BudgetExceededError
+from cache import TranslationCache
+from scheduler import QueueFullError
+from tracing import traced
+
 # Check if transliteration is available
 try:
     from google.transliteration import transliterate_text
@@ -25,92 +35,595 @@ try:
 except ImportError:
     TRANSLITERATION_AVAILABLE = False
 
+# Indian languages whose romanized form can be transliterated to native script
+INDIAN_LANGS = ['hi', 'mr', 'bn', 'gu', 'pa', 'or', 'ta', 'te', 'kn', 'ml', 'ne', 'sa']
+
+# Languages the remote detector often reports for romanized Indian text
+FALSE_POSITIVE_LANGS = ['vi', 'tl', 'id', 'ms', 'so', 'da', 'et', 'af', 'nl', 'fi', 'no', 'sw']
+
+# Google Translate rejects requests above 5000 characters; leave some headroom
+MAX_BATCH_CHARS = 4500
+
+# Patterns for word-level detection (detect_mixed_languages)
+MIXED_PATTERNS = {
+    'hi': ['ek', 'hai', 'hain', 'ko', 'ka', 'ki', 'ke', 'se', 'me', 'par', 'aur', 'ya', 'jisme', 'karta', 'kaun', 
+           'bol', 'raha', 'rahe', 'rahi', 'andar', 'bahar', 'kya', 'kab', 'kaise', 'bhi', 'toh', 'magar', 'lekin',
+           'namaste', 'namaskar', 'aap', 'tum', 'mai', 'mera', 'tera', 'theek', 'hun'],
+    'kn': ['idu', 'ide', 'tumba', 'ge', 'alli', 'illi', 'yava', 'yaake', 'hege', 'ella', 'nim', 'nanna', 'beku', 'maadi'],
+    'en': ['speaker', 'diarization', 'process', 'system', 'different', 'speakers', 'separate', 'audio', 
+           'real-time', 'applications', 'meetings', 'useful', 'like', 'and', 'is', 'the', 'for', 'to', 'in', 'of',
+           'hello', 'world', 'how', 'what', 'where', 'when'],
+    'gu': ['khem', 'cho', 'majama', 'su', 'chhe', 'tamara', 'mara'],
+    'mr': ['kasa', 'kay', 'kuthe', 'kevha', 'tumcha', 'maza'],
+    'pa': ['tuhada', 'ki', 'haal', 'hai', 'kiddan', 'sat', 'sri', 'akal'],
+    'ta': ['idu', 'enna', 'epdi', 'enge', 'yaar', 'naan', 'nee', 'avan', 'aval'],
+    'te': ['idi', 'emi', 'ela', 'ekkada', 'evaru', 'nenu', 'nuvvu', 'atanu', 'aame']
+}
+
+# Patterns for whole-segment detection (substring matches)
+DETECT_PATTERNS = {
+    'en': ['hello', 'world', 'the', 'is', 'are', 'how', 'what', 'where', 'when', 'you', 'your', 'good', 'morning', 
+           'and', 'like', 'this', 'that', 'have', 'has', 'with', 'from'],
+    'es': ['hola', 'mundo', 'como', 'que', 'donde', 'cuando', 'el', 'la', 'los', 'las'],
+    'fr': ['bonjour', 'monde', 'comment', 'que', 'où', 'quand', 'le', 'la', 'les'],
+    'de': ['hallo', 'welt', 'wie', 'was', 'wo', 'wann', 'der', 'die', 'das'],
+    'hi': ['namaste', 'namaskar', 'kaise', 'kya', 'kahan', 'kab', 'aap', 'tum', 'mai', 'mera', 'tera', 'theek', 'hun',
+           'ek', 'hai', 'hain', 'ko', 'ka', 'ki', 'ke', 'se', 'me', 'par', 'aur', 'ya', 'jisme', 'karta', 'kaun', 
+           'bol', 'raha', 'rahe', 'rahi', 'andar', 'bahar'],
+    'gu': ['khem', 'cho', 'majama', 'su', 'chhe', 'tamara', 'mara'],
+    'mr': ['kasa', 'kay', 'kuthe', 'kevha', 'tumcha', 'maza'],
+    'pa': ['tuhada', 'ki', 'haal', 'hai', 'kiddan', 'sat', 'sri', 'akal'],
+    'kn': ['idu', 'ide', 'tumba', 'ge', 'alli', 'illi', 'yava', 'yaake', 'hege', 'ella', 'nim', 'nanna'],
+    'ta': ['idu', 'enna', 'epdi', 'enge', 'yaar', 'naan', 'nee', 'avan', 'aval'],
+    'te': ['idi', 'emi', 'ela', 'ekkada', 'evaru', 'nenu', 'nuvvu', 'atanu', 'aame'],
+}
+
+# Patterns for smart segmentation; the first language listed wins for shared words
+SMART_PATTERNS = {
+    'hi': ['ek', 'hai', 'hain', 'ko', 'ka', 'ki', 'ke', 'se', 'me', 'par', 'aur', 'ya', 'jisme', 'karta', 'kaun', 
+           'bol', 'raha', 'rahe', 'rahi', 'andar', 'bahar', 'kya', 'kab', 'kaise', 'bhi', 'toh', 'magar', 'lekin'],
+    'kn': ['idu', 'ide', 'tumba', 'ge', 'alli', 'illi', 'yava', 'yaake', 'hege', 'ella', 'nim', 'nanna', 'beku', 'maadi'],
+    'en': ['speaker', 'diarization', 'process', 'system', 'different', 'speakers', 'separate', 'audio', 
+           'real-time', 'applications', 'meetings', 'useful', 'like', 'and', 'is', 'the', 'for', 'to', 'in', 'of']
+}
+
+# Word -> languages lookup tables, built once at import so per-word scans are
+# a single dict lookup instead of a pass over every vocabulary list
+MIXED_WORD_INDEX = {}
+for _lang, _vocab in MIXED_PATTERNS.items():
+    for _word in _vocab:
+        MIXED_WORD_INDEX.setdefault(_word, set()).add(_lang)
+
+SMART_WORD_INDEX = {}
+for _lang, _vocab in SMART_PATTERNS.items():
+    for _word in _vocab:
+        SMART_WORD_INDEX.setdefault(_word, _lang)
+del _lang, _vocab, _word
+
+# Assumed seconds per backend request until real requests have been timed
+DEFAULT_BACKEND_LATENCY = {'translate': 0.4, 'detect': 0.4, 'transliterate': 0.3}
+LATENCY_SMOOTHING = 0.2
+
+def is_romanized(text):
+    """
+    True if text is written only in Latin characters (e.g. Hinglish).
+    """
+    return all(ord(c) < 128 or c.isspace() or c in ',.!?;-' for c in text)
+
+class GoogleBackend:
+    """
+    Backend client used by NeuralTranslator. Every request that leaves the
+    process goes through one of these three methods.
+    """
+    def translate(self, text, source='auto', target='en'):
+        return GoogleTranslator(source=source, target=target).translate(text)
+
+    def detect(self, texts):
+        if len(texts) == 1:
+            return [single_detection(texts[0], api_key='auto')]
+        return batch_detection(texts, api_key='auto')
+
+    def transliterate(self, text, lang_code='hi'):
+        return transliterate_text(text, lang_code=lang_code)
+
+# Per-call routing information (priority class, tenant/job) for the current thread or task
+_request_context = contextvars.ContextVar('request_context', default={})
+
 class NeuralTranslator:
-    def __init__(self):
-        pass # No persistent translator needed for deep-translator
+    def __init__(self, backend=None, rate_limiter=None, scheduler=None, priority='interactive', tenant='default',
+                 meter=None, cache=None, tracer=None):
+        # No persistent translator needed for deep-translator; the backend is stateless.
+        # rate_limiter (optional) must provide acquire() and is called before every request.
+        # scheduler (optional) is a scheduler.RequestScheduler that queues backend requests
+        # by priority/tenant; priority and tenant are the defaults for this instance.
+        # meter counts characters sent (accounting.CharacterMeter) and cache holds backend
+        # answers (cache.TranslationCache); both are created if not given.
+        # tracer (optional) is a tracing.Tracer that records span trees of slow requests.
+        self.backend = backend or GoogleBackend()
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.priority = priority
+        self.tenant = tenant
+        self.meter = meter or CharacterMeter()
+        self.cache = cache if cache is not None else TranslationCache()
+        self.backend_latency = dict(DEFAULT_BACKEND_LATENCY)
+        self.tracer = tracer
+
+    @contextlib.contextmanager
+    def request_context(self, priority=None, tenant=None):
+        """
+        Run the calls inside the with-block with another priority class or tenant, e.g.
+        with translator.request_context(priority='bulk', tenant='nightly-job'): ...
+        """
+        context = dict(_request_context.get())
+        if priority:
+            context['priority'] = priority
+        if tenant:
+            context['tenant'] = tenant
+        token = _request_context.set(context)
+        try:
+            yield
+        finally:
+            _request_context.reset(token)
+
+    def _caller(self):
+        return _request_context.get().get('tenant', self.tenant)
+
+    def _budget_low(self, kind='translate', target=None):
+        return self.meter.is_low(kind=kind, target=target, caller=self._caller())
+
+    def usage(self):
+        """
+        Characters and requests sent to the backend so far (see accounting.CharacterMeter.usage).
+        """
+        return self.meter.usage()
+
+    def export_cache(self, path):
+        """
+        Save cached translations, transliterations and detections to a pack file.
+        """
+        return self.cache.export_pack(path)
 
+    def load_cache_pack(self, path):
+        """
+        Serve cache hits from a pack file exported by another node (memory-mapped).
+        """
+        return self.cache.load_pack(path)
+
+    def _span(self, name, **attrs):
+        # Child span of the traced request (a no-op without a tracer)
+        if self.tracer is None:
+            return contextlib.nullcontext()
+        return self.tracer.span(name, **attrs)
+
+    def _trace_event(self, name, **attrs):
+        if self.tracer is not None:
+            self.tracer.event(name, **attrs)
+
+    def _fallback(self, action, **attrs):
+        # Called in except blocks that swallow an error: a degraded answer
+        self.meter.record_fallback(sys.exc_info()[1])
+        self._trace_event('fallback', action=action, **attrs)
+
+    def _call_backend(self, method, chars, target_lang, *args, **kwargs):
+        caller = self._caller()
+        self.meter.check(chars, kind=method, target=target_lang, caller=caller)
+        
+        with self._span('backend.' + method, chars=chars, target=target_lang) as span:
+            def call():
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                if span is not None:
+                    # Time spent in the scheduler queue and the rate limiter
+                    span['attrs']['wait'] = round(time.monotonic() - started, 6)
+                return getattr(self.backend, method)(*args, **kwargs)
+            
+            started = time.monotonic()
+            try:
+                if self.scheduler:
+                    context = _request_context.get()
+                    result = self.scheduler.run(call, priority=context.get('priority', self.priority),
+                                                tenant=caller, cost=chars)
+                else:
+                    result = call()
+            except QueueFullError:
+                raise
+            except Exception:
+                self.meter.record_failure(kind=method, target=target_lang, caller=caller)
+                raise
+        self._record_latency(method, time.monotonic() - started)
+        self.meter.record(chars, kind=method, target=target_lang, caller=caller)
+        return result
+
+    def _record_latency(self, method, seconds):
+        # Exponentially weighted average per request kind, used by planner.StrategyPlanner
+        previous = self.backend_latency.get(method, seconds)
+        self.backend_latency[method] = previous + LATENCY_SMOOTHING * (seconds - previous)
+
+    def _cached(self, key, kind, target_lang=None):
+        value = self.cache.get(key)
+        if value is not None:
+            self.meter.record_saved(len(key[-1]), kind=kind, target=target_lang, caller=self._caller())
+            self._trace_event('cache_hit', kind=kind, chars=len(key[-1]))
+        return value
+
+    def _backend_translate(self, text, source='auto', target='en'):
+        key = ('translate', source, target, text)
+        result = self._cached(key, 'translate', target)
+        if result is None:
+            result = self._call_backend('translate', len(text), target, text, source=source, target=target)
+            self.cache.put(key, result)
+        return result
+
+    def _backend_detect(self, texts, local_only=False):
+        # Cached detections are reused; with local_only the remaining texts get None
+        detected = [self._cached(('detect', text), 'detect') for text in texts]
+        missing = [text for text, lang in zip(texts, detected) if lang is None]
+        if missing and not local_only:
+            fresh = dict(zip(missing, self._call_backend('detect', sum(len(t) for t in missing), None, missing)))
+            for text, lang in fresh.items():
+                self.cache.put(('detect', text), lang)
+            detected = [lang if lang is not None else fresh.get(text) for text, lang in zip(texts, detected)]
+        return detected
+
+    def _backend_transliterate(self, text, lang_code):
+        key = ('transliterate', lang_code, text)
+        result = self._cached(key, 'transliterate')
+        if result is None:
+            result = self._call_backend('transliterate', len(text), None, text, lang_code=lang_code)
+            self.cache.put(key, result)
+        return result
+
+    @traced('translate')
     def translate(self, text, dest='en', src='auto', split_sentences=True):
         """
         Translate text to the destination language.
         """
         try:
-            translator = GoogleTranslator(source=src, target=dest)
-            
-            # Option to translate without splitting
-            if not split_sentences:
-                return translator.translate(text)
-            
-            # Split text by sentence terminators
-            parts = re.split(r'([.!?。;]+)', text)
-            
-            translated_parts = []
-            for part in parts:
-                if not part.strip():
-                    translated_parts.append(part)
-                    continue
-                
-                leading_space = part[:len(part) - len(part.lstrip())]
-                trailing_space = part[len(part.rstrip()):]
-                stripped_part = part.strip()
-                
-                result = translator.translate(stripped_part)
-                translated_parts.append(leading_space + result + trailing_space)
-            
-            return "".join(translated_parts)
+            segments = self.iter_translate(text, dest=dest, src=src, split_sentences=split_sentences, max_workers=1)
+            return "".join(seg['translation'] for seg in segments)
         except Exception as e:
+            self.meter.record_error(e)
             return f"Error: {str(e)}"
+
+    def _sentence_plan(self, text, dest, src, split_sentences):
+        # Parts of the text, how to translate one part, and which parts are passed through
+        def translate_text(part):
+            return self._backend_translate(part, source=src, target=dest)
+        
+        # Option to translate without splitting
+        if not split_sentences:
+            return [text], translate_text, lambda part: False
+        
+        # Split text by sentence terminators
+        parts = re.split(r'([.!?。;]+)', text)
+        
+        def translate_part(part):
+            leading_space = part[:len(part) - len(part.lstrip())]
+            trailing_space = part[len(part.rstrip()):]
+            return leading_space + translate_text(part.strip()) + trailing_space
+        
+        if self._budget_low('translate', dest):
+            # Low on characters: keep punctuation-only parts instead of sending them
+            self._trace_event('budget_low', kind='translate')
+            return parts, translate_part, lambda part: not any(c.isalnum() for c in part)
+        return parts, translate_part, lambda part: not part.strip()
+
+    def _mixed_plan(self, text, dest, keep_failed=False):
+        # keep_failed: a clause the backend fails on stays untranslated instead of raising
+        parts = re.split(r'([,.!?;]+)', text)
+        
+        def translate_part(part):
+            leading_space = part[:len(part) - len(part.lstrip())]
+            trailing_space = part[len(part.rstrip()):]
+            try:
+                return leading_space + self._backend_translate(part.strip(), source='auto', target=dest) + trailing_space
+            except (BudgetExceededError, QueueFullError):
+                raise
+            except:
+                if not keep_failed:
+                    raise
+                self._fallback(action='kept untranslated part')
+                return part
+        
+        return parts, translate_part, lambda part: not part.strip() or part.strip() in ',.!?;'
+
+    def _segment_factory(self, parts):
+        # Build segment dicts with the [start, end) span of each part in the source text
+        spans = []
+        start = 0
+        for part in parts:
+            spans.append((start, start + len(part)))
+            start += len(part)
+        
+        def segment(index, translation):
+            return {'index': index, 'start': spans[index][0], 'end': spans[index][1],
+                    'source': parts[index], 'translation': translation}
+        return segment
+
+    def _begin_stream(self, name, context, parts):
+        # Trace span that stays open while a generator yields (None without a tracer)
+        if self.tracer is None:
+            return None
+        return self.tracer.begin(name, context, chars=sum(len(part) for part in parts))
+
+    def _end_stream(self, span, error=None):
+        if span is not None:
+            self.tracer.end(span, error)
+
+    def _iter_parts(self, parts, translate_part, skip, max_workers=4, ordered=True, name='iter_translate'):
+        """
+        Yield one segment dict per part as soon as its translation is ready.
+        Segments carry their index and [start, end) span in the source text so
+        out-of-order results (ordered=False) can still be placed correctly.
+        """
+        segment = self._segment_factory(parts)
+        context = contextvars.copy_context()
+        span = self._begin_stream(name, context, parts)
+        error = None
+        
+        if max_workers <= 1:
+            try:
+                for index, part in enumerate(parts):
+                    yield segment(index, part if skip(part) else context.run(translate_part, part))
+            except GeneratorExit:
+                if span is not None:
+                    span['attrs']['stopped_early'] = True
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                self._end_stream(span, error)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        try:
+            for index, part in enumerate(parts):
+                if not skip(part):
+                    futures[index] = executor.submit(context.copy().run, translate_part, part)
+            
+            if ordered:
+                for index, part in enumerate(parts):
+                    yield segment(index, futures[index].result() if index in futures else part)
+            else:
+                for index, part in enumerate(parts):
+                    if index not in futures:
+                        yield segment(index, part)
+                by_future = {future: index for index, future in futures.items()}
+                for future in as_completed(by_future):
+                    yield segment(by_future[future], future.result())
+        except GeneratorExit:
+            if span is not None:
+                span['attrs']['stopped_early'] = True
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # Consumer stopped early: drop requests that have not started yet
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+            self._end_stream(span, error)
+
+    async def _aiter_parts(self, parts, translate_part, skip, max_workers=4, ordered=True, name='aiter_translate'):
+        # asyncio counterpart of _iter_parts; backend calls run in a thread pool
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        segment = self._segment_factory(parts)
+        context = contextvars.copy_context()
+        span = self._begin_stream(name, context, parts)
+        error = None
+        
+        async def run(index, part):
+            return index, await loop.run_in_executor(executor, context.copy().run, translate_part, part)
+        
+        tasks = {}
+        try:
+            for index, part in enumerate(parts):
+                if not skip(part):
+                    tasks[index] = asyncio.ensure_future(run(index, part))
+            
+            if ordered:
+                for index, part in enumerate(parts):
+                    if index in tasks:
+                        _, translation = await tasks[index]
+                        yield segment(index, translation)
+                    else:
+                        yield segment(index, part)
+            else:
+                for index, part in enumerate(parts):
+                    if index not in tasks:
+                        yield segment(index, part)
+                for next_done in asyncio.as_completed(list(tasks.values())):
+                    index, translation = await next_done
+                    yield segment(index, translation)
+        except GeneratorExit:
+            if span is not None:
+                span['attrs']['stopped_early'] = True
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            executor.shutdown(wait=False)
+            self._end_stream(span, error)
+
+    def iter_translate(self, text, dest='en', src='auto', split_sentences=True, max_workers=4, ordered=True):
+        """
+        Generator version of translate().
+        Yields {'index', 'start', 'end', 'source', 'translation'} for every
+        sentence as soon as it is translated; joining the translations in index
+        order gives the same result as translate().
+        
+        Errors: like all iterator variants, a backend failure is raised from the
+        iterator when the failing segment is reached (earlier segments have
+        already been yielded). translate() returns "Error: ..." instead.
+        """
+        parts, translate_part, skip = self._sentence_plan(text, dest, src, split_sentences)
+        return self._iter_parts(parts, translate_part, skip, max_workers=max_workers, ordered=ordered)
+
+    def iter_translate_mixed(self, text, dest='en', max_workers=4, ordered=True):
+        """
+        Generator version of translate_mixed_text().
+        Backend failures are raised as in iter_translate(); translate_mixed_text()
+        keeps a failed clause untranslated instead.
+        """
+        parts, translate_part, skip = self._mixed_plan(text, dest)
+        return self._iter_parts(parts, translate_part, skip, max_workers=max_workers, ordered=ordered,
+                                name='iter_translate_mixed')
+
+    def aiter_translate(self, text, dest='en', src='auto', split_sentences=True, max_workers=4, ordered=True):
+        """
+        Async iterator version of translate(), for use with "async for".
+        Backend failures are raised as in iter_translate().
+        """
+        parts, translate_part, skip = self._sentence_plan(text, dest, src, split_sentences)
+        return self._aiter_parts(parts, translate_part, skip, max_workers=max_workers, ordered=ordered)
+
+    def aiter_translate_mixed(self, text, dest='en', max_workers=4, ordered=True):
+        """
+        Async iterator version of translate_mixed_text().
+        Backend failures are raised as in iter_translate().
+        """
+        parts, translate_part, skip = self._mixed_plan(text, dest)
+        return self._aiter_parts(parts, translate_part, skip, max_workers=max_workers, ordered=ordered,
+                                 name='aiter_translate_mixed')
+
+    @traced('translate_batch')
+    def translate_batch(self, texts, dest='en', src='auto'):
+        """
+        Translate a list of short texts using as few backend requests as possible.
+        Texts are packed one per line; if the backend merges or drops lines the
+        batch is halved until every text comes back on its own line. If a
+        request fails, the texts of that batch are returned unchanged and the
+        failure is counted as a fallback (see accounting.CharacterMeter.track).
+        """
+        results = list(texts)
+        pending = [i for i, t in enumerate(texts) if t.strip()]
+        for batch in self._pack(pending, texts):
+            self._translate_packed(batch, texts, results, src, dest)
+        return results
+
+    def _pack(self, indices, texts):
+        # Group indices into batches whose packed size stays under the request limit
+        batch = []
+        size = 0
+        for i in indices:
+            length = len(texts[i]) + 1
+            if batch and size + length > MAX_BATCH_CHARS:
+                yield batch
+                batch = []
+                size = 0
+            batch.append(i)
+            size += length
+        if batch:
+            yield batch
+
+    def _translate_packed(self, batch, texts, results, src, dest):
+        if len(batch) == 1:
+            i = batch[0]
+            try:
+                results[i] = self._backend_translate(texts[i].strip(), source=src, target=dest)
+            except (BudgetExceededError, QueueFullError):
+                raise
+            except:
+                self._fallback(action='kept untranslated text')
+                results[i] = texts[i]
+            return
+
+        packed = "\n".join(" ".join(texts[i].split()) for i in batch)
+        try:
+            lines = self._backend_translate(packed, source=src, target=dest).split("\n")
+        except (BudgetExceededError, QueueFullError):
+            # A shed request must not be retried as smaller requests
+            raise
+        except:
+            # A failed request is not retried as smaller ones: the batch keeps its source text
+            self._fallback(action='kept untranslated batch', size=len(batch))
+            return
+
+        if len(lines) == len(batch) and all(line.strip() for line in lines):
+            for i, line in zip(batch, lines):
+                results[i] = line.strip()
+            return
+
+        # Backend did not keep one line per text: split the batch and retry
+        self._trace_event('batch_split', size=len(batch), lines=len(lines))
+        middle = len(batch) // 2
+        self._translate_packed(batch[:middle], texts, results, src, dest)
+        self._translate_packed(batch[middle:], texts, results, src, dest)
     
+    @traced('translate_mixed_text')
     def translate_mixed_text(self, text, dest='en'):
         """
         Special translation for mixed-language text.
         """
         try:
-            translator = GoogleTranslator(source='auto', target=dest)
-            parts = re.split(r'([,.!?;]+)', text)
-            
-            translated_parts = []
-            for part in parts:
-                if not part.strip() or part.strip() in ',.!?;':
-                    translated_parts.append(part)
-                    continue
-                
-                leading_space = part[:len(part) - len(part.lstrip())]
-                trailing_space = part[len(part.rstrip()):]
-                stripped_part = part.strip()
-                
-                try:
-                    result = translator.translate(stripped_part)
-                    translated_parts.append(leading_space + result + trailing_space)
-                except:
-                    translated_parts.append(part)
-            
-            return "".join(translated_parts)
+            parts, translate_part, skip = self._mixed_plan(text, dest, keep_failed=True)
+            segments = self._iter_parts(parts, translate_part, skip, max_workers=1, name='iter_translate_mixed')
+            return "".join(seg['translation'] for seg in segments)
         except Exception as e:
+            self.meter.record_error(e)
             return f"Error: {str(e)}"
     
+    @traced('transliterate')
     def transliterate_to_native(self, text, target_script='hi'):
         if not TRANSLITERATION_AVAILABLE:
             return text
         try:
-            return transliterate_text(text, lang_code=target_script)
+            return self._backend_transliterate(text, lang_code=target_script)
+        except (BudgetExceededError, QueueFullError):
+            raise
         except:
+            self._fallback(action='kept romanized text')
             return text
+
+    @traced('transliterate_batch')
+    def transliterate_batch(self, texts, target_script='hi'):
+        """
+        Transliterate several texts with one request per packed batch.
+        Falls back to one request per text if the line structure is lost.
+        """
+        if not TRANSLITERATION_AVAILABLE:
+            return list(texts)
+        results = list(texts)
+        pending = [i for i, t in enumerate(texts) if t.strip()]
+        for batch in self._pack(pending, texts):
+            packed = "\n".join(" ".join(texts[i].split()) for i in batch)
+            lines = self.transliterate_to_native(packed, target_script).split("\n")
+            if len(lines) == len(batch):
+                for i, line in zip(batch, lines):
+                    results[i] = line.strip()
+            else:
+                self._trace_event('batch_split', size=len(batch), lines=len(lines))
+                for i in batch:
+                    results[i] = self.transliterate_to_native(texts[i], target_script)
+        return results
     
+    @traced('translate_with_transliteration')
     def translate_with_transliteration(self, text, dest='en', detected_lang=None):
         """
         Translate text with automatic transliteration.
         """
         try:
-            indian_langs = ['hi', 'mr', 'bn', 'gu', 'pa', 'or', 'ta', 'te', 'kn', 'ml', 'ne', 'sa']
-            false_positive_langs = ['vi', 'tl', 'id', 'ms', 'so', 'da', 'et', 'af', 'nl', 'fi', 'no', 'sw']
+            indian_langs = INDIAN_LANGS
+            false_positive_langs = FALSE_POSITIVE_LANGS
             
             parts = re.split(r'([,.!?;]+)', text)
+            
+            # Detect every segment up front in one batched round trip
+            segments = [part.strip() for part in parts if part.strip() and part.strip() not in ',.!?;']
+            segment_langs = iter(self.detect_languages(segments))
+            
             result_parts = []
             detected_langs_in_parts = []
             last_valid_indian_lang = None
             
-            translator = GoogleTranslator(source='auto', target=dest)
-            
             for part in parts:
                 if not part.strip() or part.strip() in ',.!?;':
                     result_parts.append(part)
@@ -120,8 +633,8 @@ class NeuralTranslator:
                 trailing_space = part[len(part.rstrip()):]
                 stripped_part = part.strip()
                 
+                part_lang = next(segment_langs)
                 try:
-                    part_lang = self.detect_language(stripped_part)
                     part_is_latin = all(ord(c) < 128 or c.isspace() for c in stripped_part)
                     
                     use_translit = False
@@ -140,66 +653,57 @@ class NeuralTranslator:
                     if use_translit:
                         native_text = self.transliterate_to_native(stripped_part, target_translit_lang)
                         # Translate native text
-                        t = GoogleTranslator(source=target_translit_lang, target=dest)
-                        result = t.translate(native_text)
+                        result = self._backend_translate(native_text, source=target_translit_lang, target=dest)
                         result_parts.append(leading_space + result + trailing_space)
                     else:
                         if part_lang not in false_positive_langs:
                             detected_langs_in_parts.append(part_lang)
-                        result = translator.translate(stripped_part)
+                        result = self._backend_translate(stripped_part, source='auto', target=dest)
                         result_parts.append(leading_space + result + trailing_space)
+                except (BudgetExceededError, QueueFullError):
+                    raise
                 except:
+                    self._fallback(action='kept untranslated part')
                     result_parts.append(part)
             
             unique_langs = list(set(detected_langs_in_parts))
             return "".join(result_parts), unique_langs
         except Exception as e:
+            self.meter.record_error(e)
             return f"Error: {str(e)}", []
 
+    @traced('analysis.patterns', root=False)
+    def _pattern_languages(self, text):
+        """
+        Languages whose pattern words occur in text (word-level, no backend request).
+        """
+        detected_langs_set = set()
+        words = text.split()
+        
+        for word in words:
+            word_lower = word.lower().strip('.,!?-')
+            if not word_lower: continue
+            
+            detected_langs_set.update(MIXED_WORD_INDEX.get(word_lower, ()))
+        
+        return detected_langs_set
+
+    @traced('detect_mixed_languages')
     def detect_mixed_languages(self, text):
         """
         Detect all languages present in a text using word-level analysis.
         """
         try:
-            # Patterns for word-level detection
-            patterns = {
-                'hi': ['ek', 'hai', 'hain', 'ko', 'ka', 'ki', 'ke', 'se', 'me', 'par', 'aur', 'ya', 'jisme', 'karta', 'kaun', 
-                       'bol', 'raha', 'rahe', 'rahi', 'andar', 'bahar', 'kya', 'kab', 'kaise', 'bhi', 'toh', 'magar', 'lekin',
-                       'namaste', 'namaskar', 'aap', 'tum', 'mai', 'mera', 'tera', 'theek', 'hun'],
-                'kn': ['idu', 'ide', 'tumba', 'ge', 'alli', 'illi', 'yava', 'yaake', 'hege', 'ella', 'nim', 'nanna', 'beku', 'maadi'],
-                'en': ['speaker', 'diarization', 'process', 'system', 'different', 'speakers', 'separate', 'audio', 
-                       'real-time', 'applications', 'meetings', 'useful', 'like', 'and', 'is', 'the', 'for', 'to', 'in', 'of',
-                       'hello', 'world', 'how', 'what', 'where', 'when'],
-                'gu': ['khem', 'cho', 'majama', 'su', 'chhe', 'tamara', 'mara'],
-                'mr': ['kasa', 'kay', 'kuthe', 'kevha', 'tumcha', 'maza'],
-                'pa': ['tuhada', 'ki', 'haal', 'hai', 'kiddan', 'sat', 'sri', 'akal'],
-                'ta': ['idu', 'enna', 'epdi', 'enge', 'yaar', 'naan', 'nee', 'avan', 'aval'],
-                'te': ['idi', 'emi', 'ela', 'ekkada', 'evaru', 'nenu', 'nuvvu', 'atanu', 'aame']
-            }
-            
-            detected_langs_set = set()
-            words = text.split()
-            
             # 1. Word-level pattern matching
-            for word in words:
-                word_lower = word.lower().strip('.,!?-')
-                if not word_lower: continue
-                
-                for lang, vocab in patterns.items():
-                    if word_lower in vocab:
-                        detected_langs_set.add(lang)
+            detected_langs_set = self._pattern_languages(text)
             
             # 2. Fallback to chunk-based detection for unknown words
             if not detected_langs_set:
                 parts = re.split(r'([,.!?;]+)', text)
-                for part in parts:
-                    if not part.strip() or part.strip() in ',.!?;': continue
-                    try:
-                        lang = self.detect_language(part.strip())
-                        if lang and lang != 'auto':
-                            detected_langs_set.add(lang)
-                    except:
-                        pass
+                segments = [part.strip() for part in parts if part.strip() and part.strip() not in ',.!?;']
+                for lang in self.detect_languages(segments):
+                    if lang and lang != 'auto':
+                        detected_langs_set.add(lang)
 
             # Convert to list
             unique_langs = list(detected_langs_set)
@@ -217,86 +721,113 @@ class NeuralTranslator:
                 'languages': lang_objects
             }
         except Exception as e:
+            self.meter.record_error(e)
             return {'error': str(e), 'is_mixed': False, 'count': 0, 'languages': []}
 
     def detect_language(self, text):
         """
         Detect language using deep-translator + patterns.
         """
-        try:
-            # Strategy 1: Native script
-            has_non_latin = any(ord(c) > 127 for c in text if c.isalpha())
-            if has_non_latin:
-                return single_detection(text, api_key='auto')
-            
-            # Strategy 2: Patterns
-            text_lower = text.lower().strip()
-            patterns = {
-                'en': ['hello', 'world', 'the', 'is', 'are', 'how', 'what', 'where', 'when', 'you', 'your', 'good', 'morning', 
-                       'and', 'like', 'this', 'that', 'have', 'has', 'with', 'from'],
-                'es': ['hola', 'mundo', 'como', 'que', 'donde', 'cuando', 'el', 'la', 'los', 'las'],
-                'fr': ['bonjour', 'monde', 'comment', 'que', 'où', 'quand', 'le', 'la', 'les'],
-                'de': ['hallo', 'welt', 'wie', 'was', 'wo', 'wann', 'der', 'die', 'das'],
-                'hi': ['namaste', 'namaskar', 'kaise', 'kya', 'kahan', 'kab', 'aap', 'tum', 'mai', 'mera', 'tera', 'theek', 'hun',
-                       'ek', 'hai', 'hain', 'ko', 'ka', 'ki', 'ke', 'se', 'me', 'par', 'aur', 'ya', 'jisme', 'karta', 'kaun', 
-                       'bol', 'raha', 'rahe', 'rahi', 'andar', 'bahar'],
-                'gu': ['khem', 'cho', 'majama', 'su', 'chhe', 'tamara', 'mara'],
-                'mr': ['kasa', 'kay', 'kuthe', 'kevha', 'tumcha', 'maza'],
-                'pa': ['tuhada', 'ki', 'haal', 'hai', 'kiddan', 'sat', 'sri', 'akal'],
-                'kn': ['idu', 'ide', 'tumba', 'ge', 'alli', 'illi', 'yava', 'yaake', 'hege', 'ella', 'nim', 'nanna'],
-                'ta': ['idu', 'enna', 'epdi', 'enge', 'yaar', 'naan', 'nee', 'avan', 'aval'],
-                'te': ['idi', 'emi', 'ela', 'ekkada', 'evaru', 'nenu', 'nuvvu', 'atanu', 'aame'],
-            }
-            
-            max_matches = 0
-            best_lang = None
-            exact_match_lang = None
-            
-            for lang, words in patterns.items():
-                matches = sum(1 for word in words if word in text_lower)
-                if matches > max_matches:
-                    max_matches = matches
-                    best_lang = lang
-                if text_lower in words:
-                    exact_match_lang = lang
-            
-            if exact_match_lang and len(text_lower.split()) == 1:
-                return exact_match_lang
-            if max_matches >= 2:
-                return best_lang
-            
-            hint_lang = best_lang if max_matches == 1 else None
-            
-            # Strategy 3: deep-translator detection
+        return self.detect_languages([text])[0]
+
+    @traced('detect_languages')
+    def detect_languages(self, segments):
+        """
+        Detect the language of each segment in a list.
+        Segments the patterns can resolve are answered locally; all remaining
+        segments go to the remote detector together in a single batched call.
+        """
+        results = [None] * len(segments)
+        hints = {}
+        remote = {}  # text -> indices, so repeated segments are detected once
+        
+        for i, text in enumerate(segments):
             try:
-                detected = single_detection(text, api_key='auto')
-                false_positive_langs = ['vi', 'tl', 'id', 'ms', 'so', 'da', 'et', 'nl', 'fi', 'no', 'af', 'sw']
-                
-                if detected in false_positive_langs and hint_lang:
-                    return hint_lang
-                if detected == 'en' and hint_lang in ['hi', 'gu', 'mr', 'pa', 'kn', 'ta', 'te']:
-                    return hint_lang
-                return detected
+                lang, hint_lang = self._detect_local(text)
             except:
-                return hint_lang if hint_lang else 'en'
+                self._fallback(action="detected as 'auto'")
+                results[i] = 'auto'
+                continue
+            if lang:
+                results[i] = lang
+            else:
+                hints[i] = hint_lang
+                remote.setdefault(text, []).append(i)
+        
+        if not remote:
+            return results
+        
+        # Strategy 3: deep-translator detection
+        # (skipped when the detection budget runs low: only cached answers are used)
+        texts = list(remote)
+        local_only = self._budget_low('detect')
+        if local_only:
+            self._trace_event('budget_low', kind='detect')
+        try:
+            detected_langs = self._backend_detect(texts, local_only=local_only)
         except:
-            return 'auto'
+            self._fallback(action='pattern hints instead of remote detection')
+            detected_langs = [None] * len(texts)
+        
+        for n, text in enumerate(texts):
+            has_non_latin = any(ord(c) > 127 for c in text if c.isalpha())
+            for i in remote[text]:
+                hint_lang = hints[i]
+                if detected_langs[n] is None:
+                    if has_non_latin:
+                        results[i] = 'auto'
+                    else:
+                        results[i] = hint_lang if hint_lang else 'en'
+                    continue
+                
+                detected = detected_langs[n]
+                if detected in FALSE_POSITIVE_LANGS and hint_lang:
+                    results[i] = hint_lang
+                elif detected == 'en' and hint_lang in ['hi', 'gu', 'mr', 'pa', 'kn', 'ta', 'te']:
+                    results[i] = hint_lang
+                else:
+                    results[i] = detected
+        return results
 
-    def translate_smart(self, text, dest='hi'):
+    @traced('analysis.detect_local', root=False)
+    def _detect_local(self, text):
         """
-        Smart segmented translation using deep-translator.
-        Strategy: Transliterate Romanized parts to Native Script first, 
-        then translate the WHOLE sentence to preserve context and grammar.
+        Pattern-based detection without a backend request.
+        Returns (lang, None) when the patterns are conclusive, otherwise
+        (None, hint_lang) so the segment can be sent to the remote detector.
         """
-        # Patterns
-        patterns = {
-            'hi': ['ek', 'hai', 'hain', 'ko', 'ka', 'ki', 'ke', 'se', 'me', 'par', 'aur', 'ya', 'jisme', 'karta', 'kaun', 
-                   'bol', 'raha', 'rahe', 'rahi', 'andar', 'bahar', 'kya', 'kab', 'kaise', 'bhi', 'toh', 'magar', 'lekin'],
-            'kn': ['idu', 'ide', 'tumba', 'ge', 'alli', 'illi', 'yava', 'yaake', 'hege', 'ella', 'nim', 'nanna', 'beku', 'maadi'],
-            'en': ['speaker', 'diarization', 'process', 'system', 'different', 'speakers', 'separate', 'audio', 
-                   'real-time', 'applications', 'meetings', 'useful', 'like', 'and', 'is', 'the', 'for', 'to', 'in', 'of']
-        }
+        # Strategy 1: Native script (remote detection only)
+        has_non_latin = any(ord(c) > 127 for c in text if c.isalpha())
+        if has_non_latin:
+            return None, None
+        
+        # Strategy 2: Patterns
+        text_lower = text.lower().strip()
+        max_matches = 0
+        best_lang = None
+        exact_match_lang = None
         
+        for lang, words in DETECT_PATTERNS.items():
+            matches = sum(1 for word in words if word in text_lower)
+            if matches > max_matches:
+                max_matches = matches
+                best_lang = lang
+            if text_lower in words:
+                exact_match_lang = lang
+        
+        if exact_match_lang and len(text_lower.split()) == 1:
+            return exact_match_lang, None
+        if max_matches >= 2:
+            return best_lang, None
+        
+        hint_lang = best_lang if max_matches == 1 else None
+        return None, hint_lang
+
+    @traced('analysis.segment_smart', root=False)
+    def _segment_smart(self, text):
+        """
+        Split romanized text into runs of words sharing the same language.
+        """
         words = text.split()
         segments = []
         current_segment = []
@@ -305,11 +836,7 @@ class NeuralTranslator:
         # 1. Segment the text
         for word in words:
             word_lower = word.lower().strip('.,!?-')
-            detected_word_lang = None
-            for lang, vocab in patterns.items():
-                if word_lower in vocab:
-                    detected_word_lang = lang
-                    break
+            detected_word_lang = SMART_WORD_INDEX.get(word_lower)
             if not word_lower.isalpha():
                 detected_word_lang = current_lang
             if not detected_word_lang:
@@ -325,7 +852,15 @@ class NeuralTranslator:
                 
         if current_segment:
             segments.append({'text': " ".join(current_segment), 'lang': current_lang})
-            
+
+        return segments
+
+    def _prepare_smart(self, text):
+        """
+        Transliterate the romanized parts of text to native script.
+        """
+        segments = self._segment_smart(text)
+        
         # 2. Pre-process: Transliterate Romanized parts to Native Script
         mixed_script_parts = []
         
@@ -341,41 +876,110 @@ class NeuralTranslator:
                 else:
                     # Keep English/Other as is
                     mixed_script_parts.append(text_seg)
+            except (BudgetExceededError, QueueFullError):
+                raise
             except:
+                self._fallback(action='kept romanized segment')
                 mixed_script_parts.append(text_seg)
         
         # Join to form the "Mixed Script" sentence
         # e.g. "Speaker diarization एक process है..."
         mixed_script_sentence = " ".join(mixed_script_parts)
+        return mixed_script_sentence
+
+    def _smart_source(self, dest):
+        # CRITICAL: For Indian target languages, we must treat the source as 'en' (English/Hinglish).
+        # If we use 'auto', Google detects the native script and assumes the Latin parts 
+        # are intentional code-switching, leaving them untranslated.
+        # By forcing 'en', we tell Google to translate the Latin parts (English) to the target.
         
-        # 3. Translate the WHOLE sentence at once
-        # This preserves grammar and context!
+        # CRITICAL REFINEMENT:
+        # 1. For Hindi Target ('hi'): Force source='en'. 
+        #    Reason: Input is usually Hinglish. If we use 'auto'/'hi', Google preserves English words (Code-switching).
+        #    Forcing 'en' makes it translate "process" -> "प्रक्रिया".
+        #
+        # 2. For Other Indian Targets ('mr', 'kn', etc.): Use source='auto'.
+        #    Reason: If input is Hinglish ("ke andar"), 'auto' detects Hindi.
+        #    Hindi -> Marathi translation is excellent ("ke andar" -> "madhil").
+        #    If we forced 'en', it would treat "ke andar" as English words and fail to translate grammar correctly.
+        return 'en' if dest == 'hi' else 'auto'
+
+    @traced('translate_smart')
+    def translate_smart(self, text, dest='hi'):
+        """
+        Smart segmented translation using deep-translator.
+        Strategy: Transliterate Romanized parts to Native Script first, 
+        then translate the WHOLE sentence to preserve context and grammar.
+        """
         try:
-            # CRITICAL: For Indian target languages, we must treat the source as 'en' (English/Hinglish).
-            # If we use 'auto', Google detects the native script and assumes the Latin parts 
-            # are intentional code-switching, leaving them untranslated.
-            # By forcing 'en', we tell Google to translate the Latin parts (English) to the target.
+            mixed_script_sentence = self._prepare_smart(text)
             
-            # CRITICAL REFINEMENT:
-            # 1. For Hindi Target ('hi'): Force source='en'. 
-            #    Reason: Input is usually Hinglish. If we use 'auto'/'hi', Google preserves English words (Code-switching).
-            #    Forcing 'en' makes it translate "process" -> "प्रक्रिया".
-            #
-            # 2. For Other Indian Targets ('mr', 'kn', etc.): Use source='auto'.
-            #    Reason: If input is Hinglish ("ke andar"), 'auto' detects Hindi.
-            #    Hindi -> Marathi translation is excellent ("ke andar" -> "madhil").
-            #    If we forced 'en', it would treat "ke andar" as English words and fail to translate grammar correctly.
-            
-            if dest == 'hi':
-                translator = GoogleTranslator(source='en', target=dest)
-            else:
-                translator = GoogleTranslator(source='auto', target=dest)
-                
-            final_translation = translator.translate(mixed_script_sentence)
+            # 3. Translate the WHOLE sentence at once
+            # This preserves grammar and context!
+            final_translation = self._backend_translate(mixed_script_sentence, source=self._smart_source(dest), target=dest)
             return final_translation
         except Exception as e:
+            self.meter.record_error(e)
             return f"Error: {str(e)}"
 
+    @traced('translate_smart_batch')
+    def translate_smart_batch(self, texts, dest='hi'):
+        """
+        Smart segmented translation for many short texts (e.g. subtitle cues).
+        Segments are transliterated per language in packed batches and the
+        resulting sentences are translated with translate_batch.
+        """
+        segmented = [self._segment_smart(text) for text in texts]
+        
+        # Transliterate all segments of the same language together
+        by_lang = {}
+        for segments in segmented:
+            for seg in segments:
+                if seg['lang'] in ['hi', 'kn', 'mr', 'gu', 'pa', 'ta', 'te', 'bn', 'ml']:
+                    by_lang.setdefault(seg['lang'], []).append(seg)
+        for lang, segs in by_lang.items():
+            natives = self.transliterate_batch([seg['text'] for seg in segs], target_script=lang)
+            for seg, native_text in zip(segs, natives):
+                seg['text'] = native_text
+        
+        sentences = [" ".join(seg['text'] for seg in segments) for segments in segmented]
+        return self.translate_batch(sentences, dest=dest, src=self._smart_source(dest))
+
+    @traced('translate_many')
+    def translate_many(self, texts, dest='en', src='auto'):
+        """
+        Translate a list of independent texts (subtitle cues, corpus lines).
+        Romanized code-mixed texts take the smart path, everything else is
+        packed with translate_batch; results come back in input order.
+        """
+        results = list(texts)
+        smart = []
+        plain = []
+        for i, text in enumerate(texts):
+            if src == 'auto' and self.is_code_mixed(text):
+                smart.append(i)
+            else:
+                plain.append(i)
+        
+        if smart:
+            translated = self.translate_smart_batch([texts[i] for i in smart], dest=dest)
+            for i, result in zip(smart, translated):
+                results[i] = result
+        if plain:
+            translated = self.translate_batch([texts[i] for i in plain], dest=dest, src=src)
+            for i, result in zip(plain, translated):
+                results[i] = result
+        return results
+
+    def is_code_mixed(self, text):
+        """
+        True if text is romanized and the pattern tables find an Indian language in it.
+        This is a purely local check; no backend request is made.
+        """
+        if not is_romanized(text):
+            return False
+        return any(lang in INDIAN_LANGS for lang in self._pattern_languages(text))
+
     def get_supported_languages(self):
         # deep-translator provides Name -> Code (e.g. {'hindi': 'hi'})
         # We need Code -> Name (e.g. {'hi': 'hindi'}) for compatibility